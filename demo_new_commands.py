@@ -10,6 +10,8 @@ from src.config import BotConfig
 
 class CommandDemoBot:
     """Demo bot to show the new commands in action."""
+
+    __slots__ = ("token", "channel_id", "client")
     
     def __init__(self, token: str, channel_id: int):
         self.token = token
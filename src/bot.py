@@ -1,41 +1,38 @@
 """Main bot module for Qurrent Events Discord Bot."""
 
 import asyncio
-import json
 import logging
-import os
 import sys
+from typing import Optional
 
+import aiohttp
 import discord
-from discord.ext import commands
+import feedparser
+from discord.ext import commands, tasks
 
 from src.config import BotConfig
 from src.cogs.youtube_feed import YouTubeFeed
 from src.cogs.news_feed import NewsFeed
 from src.cogs.management import ManagementCommands
+from src.storage import read_json, write_json
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-    ],
-)
 logger = logging.getLogger(__name__)
 
+COMMAND_PREFIX = "!q"
 DYNAMIC_SOURCES_FILE = "dynamic_sources.json"
+NEWS_STATE_FILE = "news_state.json"
+YOUTUBE_STATE_FILE = "youtube_state.json"
 
 
 def load_dynamic_sources():
     """Load dynamically added sources from file."""
-    if os.path.exists(DYNAMIC_SOURCES_FILE):
-        try:
-            with open(DYNAMIC_SOURCES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.warning(f"Could not load dynamic sources: {e}")
-    
+    try:
+        return read_json(DYNAMIC_SOURCES_FILE)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("Could not load dynamic sources: %s", e)
+
     return {"youtube_channels": [], "rss_feeds": []}
 
 
@@ -46,10 +43,23 @@ def save_dynamic_sources(youtube_channels, rss_feeds):
             "youtube_channels": youtube_channels,
             "rss_feeds": rss_feeds
         }
-        with open(DYNAMIC_SOURCES_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        write_json(DYNAMIC_SOURCES_FILE, data)
     except Exception as e:
-        logger.error(f"Could not save dynamic sources: {e}")
+        logger.error("Could not save dynamic sources: %s", e)
+
+
+def install_event_loop_policy() -> None:
+    """Use uvloop's event loop when it is installed and supported."""
+    if sys.platform == "win32":
+        return
+
+    try:
+        import uvloop
+    except ImportError:
+        return
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using uvloop event loop")
 
 
 class QurrentEventsBot(commands.Bot):
@@ -66,55 +76,116 @@ class QurrentEventsBot(commands.Bot):
         intents.message_content = True
 
         super().__init__(
-            command_prefix="!q",
+            command_prefix=COMMAND_PREFIX,
             intents=intents,
             description="Quantum computing news and updates for UVic Quantum Computing Discord",
         )
 
         self.config = config
+        self.dynamic_sources: dict[str, list[str]] = {"youtube_channels": [], "rss_feeds": []}
+        self._sources_dirty = asyncio.Event()
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self.youtube_cog: Optional[YouTubeFeed] = None
+        self.news_cog: Optional[NewsFeed] = None
 
     async def setup_hook(self) -> None:
         """Set up the bot before it connects."""
         # Remove default help command first
         self.remove_command('help')
+
+        # One connection pool for every feed the cogs download. The per-host
+        # limit is what keeps concurrent checks polite to each feed server.
+        self.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=50,
+                limit_per_host=2,
+                ttl_dns_cache=600,
+                keepalive_timeout=75,
+            ),
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={"User-Agent": feedparser.USER_AGENT},
+        )
         
         # Load dynamic sources
-        dynamic_sources = load_dynamic_sources()
+        self.dynamic_sources = await asyncio.to_thread(load_dynamic_sources)
         
         # Combine config sources with dynamic sources
-        all_youtube_channels = list(set(self.config.youtube_channels + dynamic_sources["youtube_channels"]))
-        all_rss_feeds = list(set(self.config.news_feeds + dynamic_sources["rss_feeds"]))
+        all_youtube_channels = set(self.config.youtube_channels).union(self.dynamic_sources["youtube_channels"])
+        all_rss_feeds = set(self.config.news_feeds).union(self.dynamic_sources["rss_feeds"])
         
         # Add YouTube feed cog
-        await self.add_cog(
-            YouTubeFeed(
-                self,
-                channel_ids=all_youtube_channels,
-                news_channel_id=self.config.news_channel_id,
-                check_interval=self.config.youtube_check_interval,
-            )
+        self.youtube_cog = YouTubeFeed(
+            self,
+            channel_ids=all_youtube_channels,
+            news_channel_id=self.config.news_channel_id,
+            check_interval=self.config.youtube_check_interval,
+            state_file=YOUTUBE_STATE_FILE,
+            session=self.http_session,
+            rss_base=self.config.youtube_rss_base,
         )
+        await self.add_cog(self.youtube_cog)
         logger.info("YouTube feed cog loaded")
 
         # Add News feed cog
-        await self.add_cog(
-            NewsFeed(
-                self,
-                feed_urls=all_rss_feeds,
-                news_channel_id=self.config.news_channel_id,
-                check_interval=self.config.news_check_interval,
-            )
+        self.news_cog = NewsFeed(
+            self,
+            feed_urls=all_rss_feeds,
+            news_channel_id=self.config.news_channel_id,
+            check_interval=self.config.news_check_interval,
+            state_file=NEWS_STATE_FILE,
+            session=self.http_session,
         )
+        await self.add_cog(self.news_cog)
         logger.info("News feed cog loaded")
 
         # Add management commands cog
         await self.add_cog(ManagementCommands(self))
         logger.info("Management commands cog loaded")
 
+        self._flush_dynamic_sources.start()
+
+    def add_dynamic_source(self, kind: str, source: str) -> None:
+        """
+        Record a dynamically added source and schedule it to be saved.
+
+        Args:
+            kind: Either "youtube_channels" or "rss_feeds"
+            source: The YouTube channel ID or RSS feed URL
+        """
+        sources = self.dynamic_sources[kind]
+        if source not in sources:
+            sources.append(source)
+            self._sources_dirty.set()
+
+    @tasks.loop(seconds=2.0)
+    async def _flush_dynamic_sources(self) -> None:
+        """Write dynamic sources to disk if they changed since the last flush."""
+        if self._sources_dirty.is_set():
+            await self._save_dynamic_sources()
+
+    async def _save_dynamic_sources(self) -> None:
+        """Write dynamic sources to disk without blocking the event loop."""
+        self._sources_dirty.clear()
+        await asyncio.to_thread(
+            save_dynamic_sources,
+            list(self.dynamic_sources["youtube_channels"]),
+            list(self.dynamic_sources["rss_feeds"]),
+        )
+
+    async def close(self) -> None:
+        """Flush pending dynamic source changes and shut down the bot."""
+        self._flush_dynamic_sources.cancel()
+        if self._sources_dirty.is_set():
+            await self._save_dynamic_sources()
+        await super().close()
+        # Cogs are unloaded by now, nothing else uses the session
+        if self.http_session:
+            await self.http_session.close()
+
     async def on_ready(self) -> None:
         """Called when the bot is ready."""
-        logger.info(f"Logged in as {self.user} (ID: {self.user.id})")
-        logger.info(f"Connected to {len(self.guilds)} guild(s)")
+        logger.info("Logged in as %s (ID: %s)", self.user, self.user.id)
+        logger.info("Connected to %s guild(s)", len(self.guilds))
 
         # Set status
         await self.change_presence(
@@ -124,6 +195,15 @@ class QurrentEventsBot(commands.Bot):
             )
         )
 
+    async def process_commands(self, message: discord.Message, /) -> None:
+        """Process commands, skipping messages that cannot be one."""
+        # Most messages are plain chat, so bail out before discord.py
+        # builds a Context and parses the message for them
+        if not message.content.startswith(COMMAND_PREFIX):
+            return
+
+        await super().process_commands(message)
+
     async def on_command_error(
         self, ctx: commands.Context, error: commands.CommandError
     ) -> None:
@@ -131,21 +211,27 @@ class QurrentEventsBot(commands.Bot):
         if isinstance(error, commands.CommandNotFound):
             return  # Ignore unknown commands
 
-        logger.error(f"Command error: {error}")
-
-
-# Management commands are now in src/cogs/management.py
+        logger.error("Command error: %s", error)
 
 
 def main() -> None:
     """Main entry point for the bot."""
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+        ],
+    )
+
     # Load configuration
     config = BotConfig.from_env()
 
     # Validate configuration
     is_valid, error = config.validate()
     if not is_valid:
-        logger.error(f"Configuration error: {error}")
+        logger.error("Configuration error: %s", error)
         logger.error(
             "Please set the required environment variables:\n"
             "  DISCORD_TOKEN - Your Discord bot token\n"
@@ -154,10 +240,14 @@ def main() -> None:
         sys.exit(1)
 
     # Create and run bot
+    install_event_loop_policy()
     bot = QurrentEventsBot(config)
 
     logger.info("Starting Qurrent Events Bot...")
-    bot.run(config.discord_token)
+    logger.info("Monitoring %s YouTube channels", len(config.youtube_channels))
+    logger.info("Monitoring %s news feeds", len(config.news_feeds))
+    # Logging is configured above, stop discord.py adding its own handler
+    bot.run(config.discord_token, log_handler=None)
 
 
 if __name__ == "__main__":
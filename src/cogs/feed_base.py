@@ -0,0 +1,201 @@
+"""Shared base for the cogs that poll feeds and post embeds to Discord."""
+
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+import discord
+import feedparser
+from discord.ext import commands, tasks
+
+from src.embeds import batch_embeds
+
+logger = logging.getLogger(__name__)
+
+
+class FeedCog(commands.Cog):
+    """
+    Base class for cogs that poll feeds on an interval.
+
+    Handles the HTTP session, conditional GETs, the check and state save
+    loops and batched posting. Subclasses implement the checks and the
+    state file format.
+    """
+
+    # Used in log messages, e.g. "News feed monitoring started"
+    monitor_name = "Feed"
+    # What a posted embed announces, e.g. "Posted 3 news article(s)"
+    posted_name = "item(s)"
+
+    def __init__(
+        self,
+        bot: commands.Bot,
+        news_channel_id: int,
+        check_interval: int,
+        max_concurrent_fetches: int = 10,
+        state_file: Optional[str] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
+        """
+        Initialize the feed cog.
+
+        Args:
+            bot: The Discord bot instance
+            news_channel_id: Discord channel ID to post updates to
+            check_interval: Interval between checks in seconds
+            max_concurrent_fetches: Maximum number of feeds downloaded at once
+            state_file: JSON file the cog's state is kept in across restarts
+            session: Shared HTTP session, one is created for the cog if omitted
+        """
+        self.bot = bot
+        self.news_channel_id = news_channel_id
+        self.check_interval = check_interval
+        self._check_task: Optional[tasks.Loop] = None
+        self._channel: Optional[discord.abc.Messageable] = None
+        self._err_logged = False
+        self._session = session
+        self._owns_session = session is None
+        self._fetch_semaphore = asyncio.Semaphore(max_concurrent_fetches)
+        # Validators from each feed's last response, for conditional GETs
+        self._etags: dict[str, str] = {}
+        self._last_mod: dict[str, str] = {}
+        self.state_file = state_file
+        self._state_dirty = False
+        self._save_task: Optional[tasks.Loop] = None
+
+    async def cog_load(self) -> None:
+        """Called when the cog is loaded."""
+        if self.state_file:
+            await self._load_state()
+
+        if self._owns_session:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, limit_per_host=2, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={"User-Agent": feedparser.USER_AGENT},
+            )
+
+        # Create the check task dynamically with the configured interval
+        @tasks.loop(seconds=self.check_interval)
+        async def check_feeds():
+            await self._check_feeds()
+
+        @check_feeds.before_loop
+        async def before_check():
+            await self.bot.wait_until_ready()
+            self._channel = self.bot.get_channel(self.news_channel_id)
+            if self._channel is None:
+                # Every check would fail to post, so don't run any
+                logger.error(
+                    "Could not find Discord channel %s, %s monitoring disabled",
+                    self.news_channel_id,
+                    self.monitor_name,
+                )
+                self._err_logged = True
+                check_feeds.cancel()
+
+        self._check_task = check_feeds
+        self._check_task.start()
+
+        if self.state_file:
+            @tasks.loop(minutes=5)
+            async def save_state():
+                if self._state_dirty:
+                    await self._save_state()
+
+            self._save_task = save_state
+            self._save_task.start()
+        logger.info("%s monitoring started", self.monitor_name)
+
+    async def cog_unload(self) -> None:
+        """Called when the cog is unloaded."""
+        if self._check_task:
+            self._check_task.cancel()
+        if self._save_task:
+            self._save_task.cancel()
+        if self.state_file and self._state_dirty:
+            await self._save_state()
+        # A shared session belongs to the bot, which closes it on shutdown
+        if self._owns_session and self._session:
+            await self._session.close()
+        logger.info("%s monitoring stopped", self.monitor_name)
+
+    async def _check_feeds(self) -> None:
+        """Check every feed once, run by the check loop."""
+        raise NotImplementedError
+
+    async def _load_state(self) -> None:
+        """Restore the state saved by a previous run."""
+        raise NotImplementedError
+
+    async def _save_state(self) -> None:
+        """Write the state to disk without blocking the event loop."""
+        raise NotImplementedError
+
+    async def _download(self, feed_url: str) -> Optional[tuple[bytes, dict[str, str]]]:
+        """
+        Download a feed with a conditional GET.
+
+        Args:
+            feed_url: The feed URL to fetch
+
+        Returns:
+            The body and the response's Content-Type and Content-Location,
+            or None if the feed has not changed since the last fetch
+        """
+        headers = {}
+        if feed_url in self._etags:
+            headers["If-None-Match"] = self._etags[feed_url]
+        if feed_url in self._last_mod:
+            headers["If-Modified-Since"] = self._last_mod[feed_url]
+
+        async with self._fetch_semaphore:
+            async with self._session.get(feed_url, headers=headers) as response:
+                if response.status == 304:
+                    return None
+                response.raise_for_status()
+                body = await response.read()
+
+                etag = response.headers.get("ETag")
+                if etag:
+                    self._etags[feed_url] = etag
+                last_modified = response.headers.get("Last-Modified")
+                if last_modified:
+                    self._last_mod[feed_url] = last_modified
+
+                response_headers = {
+                    "content-type": response.headers.get("Content-Type", ""),
+                    "content-location": str(response.url),
+                }
+
+        return body, response_headers
+
+    async def _post_embeds(self, embeds: list[discord.Embed]) -> None:
+        """
+        Post embeds to Discord, several per message.
+
+        Args:
+            embeds: The embeds to post, in order
+        """
+        # The channel is looked up once the bot is ready, retry if it
+        # was not in the cache yet
+        channel = self._channel or self.bot.get_channel(self.news_channel_id)
+        if not channel:
+            # Log once rather than on every post until the channel shows up
+            if not self._err_logged:
+                logger.error("Could not find Discord channel %s", self.news_channel_id)
+                self._err_logged = True
+            return
+        self._channel = channel
+        self._err_logged = False
+
+        for batch in batch_embeds(embeds):
+            # A rejected message would otherwise stop the check loop, which
+            # does not retry on Discord errors
+            try:
+                await channel.send(embeds=batch)
+            except discord.HTTPException as e:
+                logger.error("Could not post %s %s: %s", len(batch), self.posted_name, e)
+                continue
+            logger.info("Posted %s %s", len(batch), self.posted_name)
@@ -1,8 +1,8 @@
 """Management commands cog for dynamic source management."""
 
-import json
+import heapq
 import logging
-import os
+import re
 from typing import TYPE_CHECKING
 
 import discord
@@ -13,32 +13,46 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
-DYNAMIC_SOURCES_FILE = "dynamic_sources.json"
+# YouTube channel IDs are "UC" followed by 22 base64url characters
+_CHANNEL_ID_RE = re.compile(r"UC[0-9A-Za-z_-]{22}")
 
+# Added sources listed by name when acknowledging an add command, and
+# the length past which a source is shortened. This keeps the embed
+# description well under Discord's 4096 character limit.
+_ADDED_SHOWN = 10
+_ADDED_MAX_LEN = 100
 
-def load_dynamic_sources():
-    """Load dynamically added sources from file."""
-    if os.path.exists(DYNAMIC_SOURCES_FILE):
-        try:
-            with open(DYNAMIC_SOURCES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.warning(f"Could not load dynamic sources: {e}")
-    
-    return {"youtube_channels": [], "rss_feeds": []}
+# Static field values of the help embed
+_HELP_BASIC_VALUE = (
+    "`!qhelp` - Show this help message\n"
+    "`!qyoutube` - Show YouTube monitoring status\n"
+    "`!qnews` - Show news monitoring status\n"
+    "`!qstatus` - Show overall bot status\n"
+    "`!qlist-sources` - List all monitored sources"
+)
 
+_HELP_SOURCES_VALUE = (
+    "`!qadd-source-youtube UC1yNl2E66ZzKApQdRuTQ4tw`\n"
+    "Add YouTube channels (use channel IDs, separated by spaces)\n\n"
+    "`!qadd-source-rss https://example.com/feed.xml`\n"
+    "Add RSS news feeds (separated by spaces)"
+)
 
-def save_dynamic_sources(youtube_channels, rss_feeds):
-    """Save dynamically added sources to file."""
-    try:
-        data = {
-            "youtube_channels": youtube_channels,
-            "rss_feeds": rss_feeds
-        }
-        with open(DYNAMIC_SOURCES_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
-    except Exception as e:
-        logger.error(f"Could not save dynamic sources: {e}")
+_HELP_FEATURES_VALUE = (
+    "• 🎬 **YouTube Notifications** - Get alerts when quantum computing "
+    "channels upload new videos\n"
+    "• 📰 **News Updates** - Receive the latest quantum computing news "
+    "from various sources"
+)
+
+# (name, inline) for each field of the status embed, in display order
+_STATUS_FIELDS = (
+    ("Bot", True),
+    ("Guilds", True),
+    ("Latency", True),
+    ("YouTube", True),
+    ("News", True),
+)
 
 
 class ManagementCommands(commands.Cog):
@@ -46,10 +60,16 @@ class ManagementCommands(commands.Cog):
 
     def __init__(self, bot: "QurrentEventsBot"):
         self.bot = bot
+        self._help_embed = self._build_help_embed()
 
     @commands.command(name="help")
     async def qhelp(self, ctx: commands.Context) -> None:
         """Display help information."""
+        await ctx.send(embed=self._help_embed)
+
+    @staticmethod
+    def _build_help_embed() -> discord.Embed:
+        """Build the static help embed sent by the help command."""
         embed = discord.Embed(
             title="🔮 Qurrent Events Bot",
             description="Your source for quantum computing news and updates!",
@@ -58,40 +78,24 @@ class ManagementCommands(commands.Cog):
 
         embed.add_field(
             name="📋 Basic Commands",
-            value=(
-                "`!qhelp` - Show this help message\n"
-                "`!qyoutube` - Show YouTube monitoring status\n"
-                "`!qnews` - Show news monitoring status\n"
-                "`!qstatus` - Show overall bot status\n"
-                "`!qlist-sources` - List all monitored sources"
-            ),
+            value=_HELP_BASIC_VALUE,
             inline=False,
         )
         
         embed.add_field(
             name="➕ Add Sources",
-            value=(
-                "`!qadd-source-youtube UC1yNl2E66ZzKApQdRuTQ4tw`\n"
-                "Add YouTube channel (use channel ID)\n\n"
-                "`!qadd-source-rss https://example.com/feed.xml`\n"
-                "Add RSS news feed"
-            ),
+            value=_HELP_SOURCES_VALUE,
             inline=False,
         )
 
         embed.add_field(
             name="Features",
-            value=(
-                "• 🎬 **YouTube Notifications** - Get alerts when quantum computing "
-                "channels upload new videos\n"
-                "• 📰 **News Updates** - Receive the latest quantum computing news "
-                "from various sources"
-            ),
+            value=_HELP_FEATURES_VALUE,
             inline=False,
         )
 
         embed.set_footer(text="UVic Quantum Computing Discord")
-        await ctx.send(embed=embed)
+        return embed
 
     @commands.command(name="status")
     async def status(self, ctx: commands.Context) -> None:
@@ -101,135 +105,175 @@ class ManagementCommands(commands.Cog):
             color=discord.Color.green(),
         )
 
-        embed.add_field(
-            name="Bot",
-            value=f"Online as {self.bot.user}",
-            inline=True,
-        )
-        embed.add_field(
-            name="Guilds",
-            value=str(len(self.bot.guilds)),
-            inline=True,
-        )
-        embed.add_field(
-            name="Latency",
-            value=f"{round(self.bot.latency * 1000)}ms",
-            inline=True,
-        )
+        values = {
+            "Bot": f"Online as {self.bot.user}",
+            "Guilds": str(len(self.bot.guilds)),
+            "Latency": f"{round(self.bot.latency * 1000)}ms",
+        }
 
         # Get cog statuses
-        youtube_cog = self.bot.get_cog("YouTubeFeed")
-        news_cog = self.bot.get_cog("NewsFeed")
+        youtube_cog = self.bot.youtube_cog
+        news_cog = self.bot.news_cog
 
         if youtube_cog:
-            embed.add_field(
-                name="YouTube",
-                value=f"✅ Monitoring {len(youtube_cog.channel_ids)} channels",
-                inline=True,
-            )
+            values["YouTube"] = f"✅ Monitoring {len(youtube_cog.channel_ids)} channels"
 
         if news_cog:
-            embed.add_field(
-                name="News",
-                value=f"✅ Monitoring {len(news_cog.feed_urls)} feeds",
-                inline=True,
-            )
+            values["News"] = f"✅ Monitoring {len(news_cog.feed_urls)} feeds"
+
+        for name, inline in _STATUS_FIELDS:
+            if name in values:
+                embed.add_field(name=name, value=values[name], inline=inline)
 
         await ctx.send(embed=embed)
 
     @commands.command(name="add-source-youtube")
-    async def add_youtube_source(self, ctx: commands.Context, channel_id: str) -> None:
+    async def add_youtube_source(self, ctx: commands.Context, *channel_ids: str) -> None:
         """
-        Add a YouTube channel to monitor.
+        Add one or more YouTube channels to monitor.
         
-        Usage: !qadd-source-youtube UCxxxxxxxxxxxxx
+        Usage: !qadd-source-youtube UCxxxxxxxxxxxxx [UCyyyyyyyyyyyyy ...]
         """
-        # Validate YouTube channel ID format
-        if not channel_id.startswith('UC') or len(channel_id) != 24:
-            await ctx.send("❌ Invalid YouTube channel ID format. Should be 24 characters starting with 'UC'")
+        if not channel_ids:
+            await ctx.send("❌ Usage: `!qadd-source-youtube UCxxxxxxxxxxxxx`")
             return
-        
+
         # Get the YouTube feed cog
-        youtube_cog = self.bot.get_cog("YouTubeFeed")
+        youtube_cog = self.bot.youtube_cog
         if not youtube_cog:
             await ctx.send("❌ YouTube monitoring is not available")
             return
         
-        # Check if already monitoring this channel
-        if channel_id in youtube_cog.channel_ids:
-            await ctx.send(f"⚠️ Already monitoring YouTube channel: `{channel_id}`")
-            return
-        
-        # Add the channel
-        youtube_cog.channel_ids.append(channel_id)
-        
-        # Save to persistent storage
-        dynamic_sources = load_dynamic_sources()
-        if channel_id not in dynamic_sources["youtube_channels"]:
-            dynamic_sources["youtube_channels"].append(channel_id)
-            save_dynamic_sources(dynamic_sources["youtube_channels"], dynamic_sources["rss_feeds"])
-        
-        embed = discord.Embed(
-            title="✅ YouTube Channel Added",
-            description=f"Now monitoring YouTube channel: `{channel_id}`",
-            color=discord.Color.green()
-        )
-        embed.add_field(
-            name="Total Channels", 
-            value=str(len(youtube_cog.channel_ids)), 
-            inline=True
+        added = []
+        problems = []
+        for channel_id in dict.fromkeys(channel_ids):
+            # Validate YouTube channel ID format
+            if not _CHANNEL_ID_RE.fullmatch(channel_id):
+                problems.append(
+                    f"❌ Invalid YouTube channel ID `{channel_id}`. "
+                    "Should be 24 characters starting with 'UC'"
+                )
+            elif channel_id in youtube_cog.channel_ids:
+                problems.append(f"⚠️ Already monitoring YouTube channel: `{channel_id}`")
+            else:
+                youtube_cog.channel_ids.add(channel_id)
+                # Queue for persistent storage
+                self.bot.add_dynamic_source("youtube_channels", channel_id)
+                added.append(channel_id)
+                logger.info("Added YouTube channel %s via Discord command", channel_id)
+
+        await self._send_add_result(
+            ctx,
+            added,
+            problems,
+            title="YouTube Channel",
+            kind="YouTube channel",
+            total_name="Total Channels",
+            total=len(youtube_cog.channel_ids),
+            color=discord.Color.green(),
+            footer="New videos from these channels will be posted here!",
         )
-        embed.set_footer(text="New videos from this channel will be posted here!")
-        
-        await ctx.send(embed=embed)
-        logger.info(f"Added YouTube channel {channel_id} via Discord command")
 
     @commands.command(name="add-source-rss")
-    async def add_rss_source(self, ctx: commands.Context, *, feed_url: str) -> None:
+    async def add_rss_source(self, ctx: commands.Context, *feed_urls: str) -> None:
         """
-        Add an RSS feed to monitor.
+        Add one or more RSS feeds to monitor.
         
-        Usage: !qadd-source-rss https://example.com/feed.xml
+        Usage: !qadd-source-rss https://example.com/feed.xml [https://example.org/rss ...]
         """
-        # Basic URL validation
-        if not feed_url.startswith(('http://', 'https://')):
-            await ctx.send("❌ Invalid RSS feed URL. Must start with http:// or https://")
+        if not feed_urls:
+            await ctx.send("❌ Usage: `!qadd-source-rss https://example.com/feed.xml`")
             return
-        
+
         # Get the news feed cog
-        news_cog = self.bot.get_cog("NewsFeed")
+        news_cog = self.bot.news_cog
         if not news_cog:
             await ctx.send("❌ News monitoring is not available")
             return
         
-        # Check if already monitoring this feed
-        if feed_url in news_cog.feed_urls:
-            await ctx.send(f"⚠️ Already monitoring RSS feed: `{feed_url}`")
+        added = []
+        problems = []
+        for feed_url in dict.fromkeys(feed_urls):
+            # Basic URL validation
+            if not feed_url.startswith(('http://', 'https://')):
+                problems.append(
+                    f"❌ Invalid RSS feed URL `{feed_url}`. Must start with http:// or https://"
+                )
+            elif feed_url in news_cog.feed_urls:
+                problems.append(f"⚠️ Already monitoring RSS feed: `{feed_url}`")
+            else:
+                news_cog.feed_urls.add(feed_url)
+                # Queue for persistent storage
+                self.bot.add_dynamic_source("rss_feeds", feed_url)
+                added.append(feed_url)
+                logger.info("Added RSS feed %s via Discord command", feed_url)
+
+        await self._send_add_result(
+            ctx,
+            added,
+            problems,
+            title="RSS Feed",
+            kind="RSS feed",
+            total_name="Total Feeds",
+            total=len(news_cog.feed_urls),
+            color=discord.Color.blue(),
+            footer="Quantum-related articles from these feeds will be posted here!",
+        )
+
+    @staticmethod
+    async def _send_add_result(
+        ctx: commands.Context,
+        added: list[str],
+        problems: list[str],
+        *,
+        title: str,
+        kind: str,
+        total_name: str,
+        total: int,
+        color: discord.Color,
+        footer: str,
+    ) -> None:
+        """
+        Acknowledge a batch of added sources with a single message.
+
+        Args:
+            ctx: The command context
+            added: Sources that were added
+            problems: One line per source that was rejected or already monitored
+            title: Source kind for the embed title, e.g. "RSS Feed"
+            kind: Source kind for the description, e.g. "RSS feed"
+            total_name: Name of the total count field
+            total: Total number of sources of this kind after the additions
+            color: Embed color
+            footer: Embed footer text
+        """
+        if not added:
+            await ctx.send("\n".join(problems)[:2000])
             return
-        
-        # Add the feed
-        news_cog.feed_urls.append(feed_url)
-        
-        # Save to persistent storage
-        dynamic_sources = load_dynamic_sources()
-        if feed_url not in dynamic_sources["rss_feeds"]:
-            dynamic_sources["rss_feeds"].append(feed_url)
-            save_dynamic_sources(dynamic_sources["youtube_channels"], dynamic_sources["rss_feeds"])
-        
+
+        plural = "s" if len(added) > 1 else ""
+        description = f"Now monitoring {kind}{plural}: " + ", ".join(
+            f"`{s[:_ADDED_MAX_LEN]}...`" if len(s) > _ADDED_MAX_LEN else f"`{s}`"
+            for s in added[:_ADDED_SHOWN]
+        )
+        if len(added) > _ADDED_SHOWN:
+            description += f"\n... and {len(added) - _ADDED_SHOWN} more"
+
         embed = discord.Embed(
-            title="✅ RSS Feed Added",
-            description=f"Now monitoring RSS feed: `{feed_url}`",
-            color=discord.Color.blue()
+            title=f"✅ {title}{plural} Added",
+            description=description,
+            color=color,
         )
         embed.add_field(
-            name="Total Feeds", 
-            value=str(len(news_cog.feed_urls)), 
-            inline=True
+            name=total_name,
+            value=str(total),
+            inline=True,
         )
-        embed.set_footer(text="Quantum-related articles from this feed will be posted here!")
-        
+        if problems:
+            embed.add_field(name="Skipped", value="\n".join(problems)[:1024], inline=False)
+        embed.set_footer(text=footer)
+
         await ctx.send(embed=embed)
-        logger.info(f"Added RSS feed {feed_url} via Discord command")
 
     @commands.command(name="list-sources")
     async def list_sources(self, ctx: commands.Context) -> None:
@@ -240,27 +284,34 @@ class ManagementCommands(commands.Cog):
         )
         
         # YouTube channels
-        youtube_cog = self.bot.get_cog("YouTubeFeed")
+        youtube_cog = self.bot.youtube_cog
         if youtube_cog:
-            youtube_list = "\n".join([f"• `{ch}`" for ch in youtube_cog.channel_ids[:10]])
-            if len(youtube_cog.channel_ids) > 10:
-                youtube_list += f"\n... and {len(youtube_cog.channel_ids) - 10} more"
+            channel_count = len(youtube_cog.channel_ids)
+            youtube_list = "\n".join(
+                f"• `{ch}`" for ch in heapq.nsmallest(10, youtube_cog.channel_ids)
+            )
+            if channel_count > 10:
+                youtube_list += f"\n... and {channel_count - 10} more"
             
             embed.add_field(
-                name=f"🎬 YouTube Channels ({len(youtube_cog.channel_ids)})",
+                name=f"🎬 YouTube Channels ({channel_count})",
                 value=youtube_list or "None",
                 inline=False
             )
         
         # RSS feeds
-        news_cog = self.bot.get_cog("NewsFeed")
+        news_cog = self.bot.news_cog
         if news_cog:
-            rss_list = "\n".join([f"• {url[:50]}..." if len(url) > 50 else f"• {url}" for url in news_cog.feed_urls[:5]])
-            if len(news_cog.feed_urls) > 5:
-                rss_list += f"\n... and {len(news_cog.feed_urls) - 5} more"
+            feed_count = len(news_cog.feed_urls)
+            rss_list = "\n".join(
+                f"• {url[:50]}..." if len(url) > 50 else f"• {url}"
+                for url in heapq.nsmallest(5, news_cog.feed_urls)
+            )
+            if feed_count > 5:
+                rss_list += f"\n... and {feed_count - 5} more"
             
             embed.add_field(
-                name=f"📰 RSS Feeds ({len(news_cog.feed_urls)})",
+                name=f"📰 RSS Feeds ({feed_count})",
                 value=rss_list or "None",
                 inline=False
             )
@@ -1,68 +1,262 @@
 """News feed monitoring cog for the Discord bot."""
 
 import asyncio
-import hashlib
+import html
+import io
 import logging
 import re
-from datetime import datetime, timezone
-from typing import Optional
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from typing import Iterable, Optional
+from urllib.parse import urljoin
 
+import aiohttp
 import discord
 import feedparser
-from discord.ext import commands, tasks
+import xxhash
+from discord.ext import commands
+
+from src.cogs.feed_base import FeedCog
+from src.embeds import format_published
+from src.storage import read_json, write_json
 
 logger = logging.getLogger(__name__)
 
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Seconds per sy:updatePeriod value of the RSS syndication module
+_UPDATE_PERIODS = {
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 604800,
+    "monthly": 2592000,
+    "yearly": 31536000,
+}
+
+# The longest a feed's own update hint may postpone its next check
+_MAX_FEED_HINT = 86400
+
+# Only the newest entries of each feed are checked for new articles
+_MAX_ENTRIES = 10
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_SY = "{http://purl.org/rss/1.0/modules/syndication/}"
+_CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+
+# Keywords that mark an article as quantum computing related. Longer
+# terms such as "qubits", "quantum computing" or "ibm quantum" are left
+# out, since any text containing them also contains a keyword below.
+QUANTUM_KEYWORDS = (
+    "quantum",
+    "qubit",
+    "superposition",
+    "entanglement",
+    "d-wave",
+    "ionq",
+    "rigetti",
+)
+
+
+def _text(elem: Optional[ET.Element]) -> str:
+    """Return an element's text with surrounding whitespace removed."""
+    if elem is None:
+        return ""
+    return "".join(elem.itertext()).strip()
+
+
+def _parse_rss_item(item: ET.Element, base_url: str) -> dict:
+    """Read the fields the cog uses from an RSS 2.0 <item>."""
+    link = _text(item.find("link"))
+    if not link:
+        # Like feedparser, a permalink guid stands in for a missing link
+        guid = item.find("guid")
+        if guid is not None and guid.get("isPermaLink", "true").lower() != "false":
+            link = _text(guid)
+    summary = _text(item.find("description")) or _text(item.find(f"{_CONTENT}encoded"))
+    fields = {
+        "title": _text(item.find("title")),
+        "link": urljoin(base_url, link) if link else "",
+        "summary": summary,
+        "published": _text(item.find("pubDate")),
+    }
+    # Like feedparser, leave out fields the item does not have
+    return {key: value for key, value in fields.items() if value}
+
+
+def _parse_atom_entry(item: ET.Element, base_url: str) -> dict:
+    """Read the fields the cog uses from an Atom <entry>."""
+    summary = item.find(f"{_ATOM}summary")
+    if summary is None:
+        summary = item.find(f"{_ATOM}content")
+    # Only the entry's own links, not those of a nested <source>
+    link = ""
+    for elem in item.findall(f"{_ATOM}link"):
+        if elem.get("rel", "alternate") == "alternate" and elem.get("href"):
+            link = elem.get("href")
+            break
+    else:
+        # Like feedparser, the entry's id stands in for a missing link
+        link = _text(item.find(f"{_ATOM}id"))
+    fields = {
+        "title": _text(item.find(f"{_ATOM}title")),
+        "link": urljoin(base_url, link) if link else "",
+        "summary": _text(summary),
+        "published": _text(item.find(f"{_ATOM}published")),
+    }
+    # Like feedparser, leave out fields the entry does not have
+    return {key: value for key, value in fields.items() if value}
+
+
+def _parse_news_feed(body: bytes, base_url: str) -> Optional[feedparser.FeedParserDict]:
+    """
+    Parse the feed title, update hints and newest entries of an RSS or Atom feed.
+
+    The feed is parsed incrementally, each entry is cleared once read and
+    parsing stops after the entries the cog looks at. The result has the
+    same shape as feedparser's for the fields the cog uses.
+
+    Args:
+        body: The raw feed XML
+        base_url: The feed URL, used to resolve relative links
+
+    Returns:
+        The parsed feed, or None if it is not well-formed RSS 2.0 or Atom
+    """
+    feed_info = feedparser.FeedParserDict()
+    entries: list[dict] = []
+    parse_entry = None
+    depth = 0
+
+    try:
+        for event, elem in ET.iterparse(io.BytesIO(body), events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if parse_entry is None:
+                    if elem.tag == "rss":
+                        parse_entry, entry_tag, feed_depth = _parse_rss_item, "item", 3
+                    elif elem.tag == f"{_ATOM}feed":
+                        parse_entry, entry_tag, feed_depth = _parse_atom_entry, f"{_ATOM}entry", 2
+                    else:
+                        return None  # RSS 1.0 and other formats
+                continue
 
-class NewsFeed(commands.Cog):
+            if elem.tag == entry_tag:
+                entries.append(parse_entry(elem, base_url))
+                elem.clear()
+                if len(entries) == _MAX_ENTRIES:
+                    break
+            elif depth == feed_depth:
+                # Feed level metadata, read before the entries in practice
+                if elem.tag in ("title", f"{_ATOM}title"):
+                    feed_info["title"] = _text(elem)
+                elif elem.tag == "ttl":
+                    feed_info["ttl"] = _text(elem)
+                elif elem.tag == f"{_SY}updatePeriod":
+                    feed_info["sy_updateperiod"] = _text(elem)
+                elif elem.tag == f"{_SY}updateFrequency":
+                    feed_info["sy_updatefrequency"] = _text(elem)
+            depth -= 1
+    except ET.ParseError:
+        return None
+
+    if parse_entry is None:
+        return None
+    return feedparser.FeedParserDict(bozo=False, feed=feed_info, entries=entries)
+
+
+def _parse_feed(body: bytes, response_headers: dict) -> feedparser.FeedParserDict:
+    """
+    Parse a news feed, falling back to feedparser for unusual feeds.
+
+    Args:
+        body: The raw feed XML
+        response_headers: The Content-Type and Content-Location of the response
+
+    Returns:
+        The parsed feed
+    """
+    feed = _parse_news_feed(body, response_headers["content-location"])
+    if feed is None:
+        return feedparser.parse(body, response_headers=response_headers)
+    feed["headers"] = response_headers
+    return feed
+
+
+class NewsFeed(FeedCog):
     """Cog for monitoring news RSS feeds and posting new articles."""
 
+    monitor_name = "News feed"
+    posted_name = "news article(s)"
+
     def __init__(
         self,
         bot: commands.Bot,
-        feed_urls: list[str],
+        feed_urls: Iterable[str],
         news_channel_id: int,
         check_interval: int = 1800,
+        max_concurrent_fetches: int = 10,
+        state_file: Optional[str] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        max_seen_articles: int = 10_000,
     ):
         """
         Initialize the news feed cog.
 
         Args:
             bot: The Discord bot instance
-            feed_urls: List of RSS feed URLs to monitor
+            feed_urls: RSS feed URLs to monitor
             news_channel_id: Discord channel ID to post updates to
             check_interval: Interval between checks in seconds
+            max_concurrent_fetches: Maximum number of feeds downloaded at once
+            state_file: JSON file seen article IDs are kept in across restarts
+            session: Shared HTTP session, one is created for the cog if omitted
+            max_seen_articles: Number of recent article IDs remembered for dedup
         """
-        self.bot = bot
-        self.feed_urls = feed_urls
-        self.news_channel_id = news_channel_id
-        self.check_interval = check_interval
-        self.seen_articles: set[str] = set()
-        self._check_task: Optional[tasks.Loop] = None
+        super().__init__(
+            bot,
+            news_channel_id,
+            check_interval,
+            max_concurrent_fetches=max_concurrent_fetches,
+            state_file=state_file,
+            session=session,
+        )
+        self.feed_urls: set[str] = set(feed_urls)
+        # Recently seen article IDs, oldest first, capped at _max_seen
+        self.seen_articles: OrderedDict[int, None] = OrderedDict()
+        self._max_seen = max_seen_articles
+        # Monotonic times before which a feed's update hints say to skip it
+        self._next_check: dict[str, float] = {}
         self._initialized = False
 
-    async def cog_load(self) -> None:
-        """Called when the cog is loaded."""
-        # Create the check task dynamically with the configured interval
-        @tasks.loop(seconds=self.check_interval)
-        async def check_news():
-            await self._check_news_feeds()
-
-        @check_news.before_loop
-        async def before_check():
-            await self.bot.wait_until_ready()
-
-        self._check_task = check_news
-        self._check_task.start()
-        logger.info("News feed monitoring started")
-
-    async def cog_unload(self) -> None:
-        """Called when the cog is unloaded."""
-        if self._check_task:
-            self._check_task.cancel()
-        logger.info("News feed monitoring stopped")
+    async def _load_state(self) -> None:
+        """Restore seen article IDs saved by a previous run."""
+        try:
+            state = await asyncio.to_thread(read_json, self.state_file)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Could not load news feed state: %s", e)
+            return
 
-    def _get_article_id(self, entry: dict) -> str:
+        seen = state.get("seen_articles", [])[-self._max_seen:]
+        self.seen_articles = OrderedDict.fromkeys(seen)
+        # Articles seen before the restart are known, so the warm-up run
+        # that only records IDs can be skipped
+        if self.seen_articles:
+            self._initialized = True
+        logger.info("Loaded %s seen articles from %s", len(self.seen_articles), self.state_file)
+
+    async def _save_state(self) -> None:
+        """Write seen article IDs to disk without blocking the event loop."""
+        self._state_dirty = False
+        state = {"seen_articles": list(self.seen_articles)}
+        try:
+            await asyncio.to_thread(write_json, self.state_file, state)
+        except Exception as e:
+            logger.error("Could not save news feed state: %s", e)
+
+    def _get_article_id(self, entry: dict) -> int:
         """
         Generate a unique ID for an article.
 
@@ -70,61 +264,160 @@ class NewsFeed(commands.Cog):
             entry: The feed entry
 
         Returns:
-            A unique hash string for the article
+            A 64-bit fingerprint of the article
         """
         # Use link or title+summary as unique identifier
-        unique_str = entry.get("link", "") or (
-            entry.get("title", "") + entry.get("summary", "")
-        )
-        return hashlib.sha256(unique_str.encode()).hexdigest()[:16]
+        link = entry.get("link", "")
+        if link:
+            return xxhash.xxh64_intdigest(link.encode())
+
+        # Stream both parts into the hasher rather than concatenating them,
+        # the digest is the same as for the joined string
+        hasher = xxhash.xxh64()
+        hasher.update(entry.get("title", "").encode())
+        hasher.update(entry.get("summary", "").encode())
+        return hasher.intdigest()
+
+    async def _check_feeds(self) -> None:
+        """Check the news feeds, run by the check loop."""
+        await self._check_news_feeds()
 
     async def _check_news_feeds(self) -> None:
         """Check all configured news feeds for new articles."""
-        for feed_url in self.feed_urls:
-            try:
-                await self._check_feed(feed_url)
-            except Exception as e:
-                logger.error(f"Error checking news feed {feed_url}: {e}")
-            # Small delay between feed checks
-            await asyncio.sleep(2)
+        # Snapshot the feeds, more may be added while we await. Feeds that
+        # asked to be polled less often than we check are left out.
+        now = time.monotonic()
+        feed_urls = tuple(
+            feed_url for feed_url in self.feed_urls
+            if self._next_check.get(feed_url, 0.0) <= now
+        )
+        results = await asyncio.gather(
+            *(self._check_feed(feed_url) for feed_url in feed_urls),
+            return_exceptions=True,
+        )
+        embeds: list[discord.Embed] = []
+        for feed_url, result in zip(feed_urls, results):
+            if isinstance(result, Exception):
+                logger.error("Error checking news feed %s: %s", feed_url, result)
+            else:
+                embeds.extend(result)
+
+        if embeds:
+            await self._post_embeds(embeds)
 
         # Mark as initialized after first run
         if not self._initialized:
             self._initialized = True
-            logger.info(f"News feed monitoring initialized with {len(self.seen_articles)} articles tracked")
+            logger.info("News feed monitoring initialized with %s articles tracked", len(self.seen_articles))
 
-    async def _check_feed(self, feed_url: str) -> None:
+    async def _check_feed(self, feed_url: str) -> list[discord.Embed]:
         """
         Check a single news feed for new articles.
 
         Args:
             feed_url: The RSS feed URL to check
+
+        Returns:
+            Embeds for the new quantum-related articles, ready to post
         """
-        # Run feedparser in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        feed = await loop.run_in_executor(None, feedparser.parse, feed_url)
+        embeds: list[discord.Embed] = []
+
+        feed = await self._fetch_feed(feed_url)
+        if feed is None:
+            return embeds  # Unchanged since the last check
 
         if feed.bozo:
-            logger.warning(f"Error parsing feed {feed_url}: {feed.bozo_exception}")
-            return
+            logger.warning("Error parsing feed %s: %s", feed_url, feed.bozo_exception)
+            return embeds
 
-        feed_title = feed.feed.get("title", "Unknown Source")
+        interval = self._feed_update_interval(feed.feed)
+        if interval and interval > self.check_interval:
+            self._next_check[feed_url] = time.monotonic() + interval
+        else:
+            self._next_check.pop(feed_url, None)
 
-        for entry in feed.entries[:10]:  # Check latest 10 entries
-            article_id = self._get_article_id(entry)
+        feed_title = feed.feed.get("title", "Unknown Source")
 
-            if article_id in self.seen_articles:
+        for entry in feed.entries[:_MAX_ENTRIES]:
+            if not self._mark_seen(self._get_article_id(entry)):
                 continue
 
-            self.seen_articles.add(article_id)
-
             # Skip posting during initialization
             if not self._initialized:
                 continue
 
             # Check if article is quantum computing related
             if self._is_quantum_related(entry):
-                await self._post_article(entry, feed_title)
+                embeds.append(self._build_article_embed(entry, feed_title))
+
+        return embeds
+
+    def _mark_seen(self, article_id: int) -> bool:
+        """
+        Record an article as seen, evicting the oldest IDs past the cap.
+
+        Args:
+            article_id: The article's ID from _get_article_id
+
+        Returns:
+            True if the article had not been seen before
+        """
+        if article_id in self.seen_articles:
+            # Keep articles still listed in a feed from being evicted
+            self.seen_articles.move_to_end(article_id)
+            return False
+
+        self.seen_articles[article_id] = None
+        self._state_dirty = True
+        while len(self.seen_articles) > self._max_seen:
+            self.seen_articles.popitem(last=False)
+        return True
+
+    async def _fetch_feed(self, feed_url: str) -> Optional[feedparser.FeedParserDict]:
+        """
+        Download and parse a news feed.
+
+        Args:
+            feed_url: The RSS feed URL to fetch
+
+        Returns:
+            The parsed feed, or None if it has not changed since the last fetch
+        """
+        download = await self._download(feed_url)
+        if download is None:
+            return None
+        body, response_headers = download
+
+        # The response headers let feedparser pick the encoding from the real
+        # Content-Type and resolve relative links against the URL. Parse in
+        # executor to avoid blocking.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _parse_feed, body, response_headers)
+
+    @staticmethod
+    def _feed_update_interval(feed_info: dict) -> Optional[int]:
+        """
+        Read how often a feed says it is updated.
+
+        Args:
+            feed_info: The feed-level metadata of a parsed feed
+
+        Returns:
+            The update interval in seconds, or None if the feed gives no hint
+        """
+        try:
+            # RSS <ttl>, in minutes
+            if "ttl" in feed_info:
+                interval = int(feed_info["ttl"]) * 60
+            elif "sy_updateperiod" in feed_info:
+                period = _UPDATE_PERIODS[feed_info["sy_updateperiod"].strip().lower()]
+                interval = period // max(int(feed_info.get("sy_updatefrequency", 1)), 1)
+            else:
+                return None
+        except (KeyError, ValueError):
+            return None
+
+        return min(interval, _MAX_FEED_HINT) if interval > 0 else None
 
     def _is_quantum_related(self, entry: dict) -> bool:
         """
@@ -136,38 +429,11 @@ class NewsFeed(commands.Cog):
         Returns:
             True if the article appears to be quantum-related
         """
-        quantum_keywords = [
-            "quantum",
-            "qubit",
-            "qubits",
-            "superposition",
-            "entanglement",
-            "quantum computer",
-            "quantum computing",
-            "quantum supremacy",
-            "quantum advantage",
-            "quantum processor",
-            "quantum algorithm",
-            "quantum cryptography",
-            "quantum network",
-            "quantum internet",
-            "quantum simulation",
-            "quantum error",
-            "quantum gate",
-            "ibm quantum",
-            "google quantum",
-            "d-wave",
-            "ionq",
-            "rigetti",
-            "quantum machine learning",
-        ]
-
-        # Check title and summary
-        title = entry.get("title", "").lower()
-        summary = entry.get("summary", "").lower()
-        content = title + " " + summary
-
-        return any(keyword in content for keyword in quantum_keywords)
+        # Check title and summary, lowercased together in a single pass.
+        # A re.IGNORECASE alternation avoids the copy but is far slower.
+        content = f"{entry.get('title', '')} {entry.get('summary', '')}".lower()
+
+        return any(keyword in content for keyword in QUANTUM_KEYWORDS)
 
     async def _post_article(self, entry: dict, source_name: str) -> None:
         """
@@ -177,28 +443,37 @@ class NewsFeed(commands.Cog):
             entry: The feed entry containing article information
             source_name: The name of the news source
         """
-        channel = self.bot.get_channel(self.news_channel_id)
-        if not channel:
-            logger.error(f"Could not find Discord channel {self.news_channel_id}")
-            return
+        await self._post_embeds([self._build_article_embed(entry, source_name)])
+
+    def _build_article_embed(self, entry: dict, source_name: str) -> discord.Embed:
+        """
+        Build the notification embed for an article.
+
+        Args:
+            entry: The feed entry containing article information
+            source_name: The name of the news source
 
+        Returns:
+            The article embed
+        """
         title = entry.get("title", "Unknown Title")
         url = entry.get("link", "")
         summary = entry.get("summary", "No summary available.")
 
+        # Clean up HTML before truncating, so a cut can't split a tag or
+        # entity and leave markup behind in the embed
+        summary = self._clean_html(summary)
+
         # Truncate summary if too long
         if len(summary) > 300:
             summary = summary[:297] + "..."
 
-        # Clean up HTML from summary
-        summary = self._clean_html(summary)
-
         embed = discord.Embed(
             title=f"📰 {title}",
             url=url,
             description=summary,
             color=discord.Color.blue(),
-            timestamp=datetime.now(timezone.utc),
+            timestamp=discord.utils.utcnow(),
         )
 
         embed.add_field(name="Source", value=source_name, inline=True)
@@ -206,16 +481,14 @@ class NewsFeed(commands.Cog):
         # Try to get publication date
         published = entry.get("published", "")
         if published:
-            embed.add_field(name="Published", value=published[:25], inline=True)
+            embed.add_field(name="Published", value=format_published(published), inline=True)
 
         embed.set_footer(text="Qurrent Events • News")
-
-        await channel.send(embed=embed)
-        logger.info(f"Posted news article: {title} from {source_name}")
+        return embed
 
     def _clean_html(self, text: str) -> str:
         """
-        Remove basic HTML tags from text.
+        Remove HTML tags and decode HTML entities in text.
 
         Args:
             text: The text to clean
@@ -223,12 +496,11 @@ class NewsFeed(commands.Cog):
         Returns:
             Text with HTML tags removed
         """
-        clean = re.sub(r"<[^>]+>", "", text)
-        clean = clean.replace("&nbsp;", " ")
-        clean = clean.replace("&amp;", "&")
-        clean = clean.replace("&lt;", "<")
-        clean = clean.replace("&gt;", ">")
-        clean = clean.replace("&quot;", '"')
+        # Most summaries are plain text, skip the regex when there are no tags
+        clean = _TAG_RE.sub("", text) if "<" in text else text
+        # Decode all entities in one pass, keeping &nbsp; as a plain space.
+        # html.unescape returns at once when there is no "&".
+        clean = html.unescape(clean).replace("\xa0", " ")
         return clean.strip()
 
     @commands.command(name="news")
@@ -269,5 +541,8 @@ async def setup(bot: commands.Bot) -> None:
             feed_urls=config.get("feed_urls", []),
             news_channel_id=config.get("news_channel_id", 0),
             check_interval=config.get("check_interval", 1800),
+            max_concurrent_fetches=config.get("max_concurrent_fetches", 10),
+            session=getattr(bot, "http_session", None),
+            max_seen_articles=config.get("max_seen_articles", 10_000),
         )
     )
@@ -1,113 +1,265 @@
 """YouTube feed monitoring cog for the Discord bot."""
 
 import asyncio
+import io
 import logging
-from datetime import datetime, timezone
-from typing import Optional
+import xml.etree.ElementTree as ET
+from collections import deque
+from typing import Iterable, Optional
 
+import aiohttp
 import discord
 import feedparser
-from discord.ext import commands, tasks
+from discord.ext import commands
 
-logger = logging.getLogger(__name__)
+from src.cogs.feed_base import FeedCog
+from src.config import DEFAULT_YOUTUBE_RSS_BASE
+from src.embeds import format_published
+from src.storage import read_json, write_json
 
+logger = logging.getLogger(__name__)
 
-class YouTubeFeed(commands.Cog):
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_YT = "{http://www.youtube.com/xml/schemas/2015}"
+_MEDIA = "{http://search.yahoo.com/mrss/}"
+
+# Recent videos remembered per channel, so a deleted or re-ordered upload
+# does not make an older video look new
+_VIDEO_HISTORY = 50
+
+
+def _parse_latest_video(body: bytes) -> feedparser.FeedParserDict:
+    """
+    Parse the channel title and newest video from a channel's Atom feed.
+
+    The feed is parsed incrementally and parsing stops after the first
+    entry, which is the only one the cog looks at. The result has the
+    same shape as feedparser's for the fields the cog uses.
+
+    Args:
+        body: The raw feed XML
+
+    Returns:
+        The parsed feed, with at most one entry
+    """
+    feed_info: dict = {}
+    entries: list[dict] = []
+    in_entry = False
+
+    try:
+        for event, elem in ET.iterparse(io.BytesIO(body), events=("start", "end")):
+            if event == "start":
+                if elem.tag == f"{_ATOM}entry":
+                    in_entry = True
+                continue
+
+            if elem.tag == f"{_ATOM}title" and not in_entry:
+                feed_info["title"] = elem.text or ""
+            elif elem.tag == f"{_ATOM}entry":
+                entry = {
+                    "title": elem.findtext(f"{_ATOM}title", ""),
+                    "yt_videoid": elem.findtext(f"{_YT}videoId", ""),
+                    "published": elem.findtext(f"{_ATOM}published", ""),
+                }
+                for link in elem.iter(f"{_ATOM}link"):
+                    if link.get("rel", "alternate") == "alternate":
+                        entry["link"] = link.get("href", "")
+                        break
+                thumbnail = elem.find(f"{_MEDIA}group/{_MEDIA}thumbnail")
+                if thumbnail is not None:
+                    entry["media_thumbnail"] = [dict(thumbnail.attrib)]
+                entries.append(entry)
+                break
+    except ET.ParseError as e:
+        return feedparser.FeedParserDict(bozo=True, bozo_exception=e, feed=feed_info, entries=[])
+
+    return feedparser.FeedParserDict(bozo=False, feed=feed_info, entries=entries)
+
+
+class YouTubeFeed(FeedCog):
     """Cog for monitoring YouTube channels and posting new videos."""
 
+    monitor_name = "YouTube feed"
+    posted_name = "new video(s)"
+
     def __init__(
         self,
         bot: commands.Bot,
-        channel_ids: list[str],
+        channel_ids: Iterable[str],
         news_channel_id: int,
         check_interval: int = 3600,
+        max_concurrent_fetches: int = 10,
+        state_file: Optional[str] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        rss_base: str = DEFAULT_YOUTUBE_RSS_BASE,
     ):
         """
         Initialize the YouTube feed cog.
 
         Args:
             bot: The Discord bot instance
-            channel_ids: List of YouTube channel IDs to monitor
+            channel_ids: YouTube channel IDs to monitor
             news_channel_id: Discord channel ID to post updates to
             check_interval: Interval between checks in seconds
+            max_concurrent_fetches: Maximum number of feeds downloaded at once
+            state_file: JSON file the latest video IDs are kept in across restarts
+            session: Shared HTTP session, one is created for the cog if omitted
+            rss_base: Base URL of the channel feeds, e.g. a YouTube-compatible mirror
         """
-        self.bot = bot
-        self.channel_ids = channel_ids
-        self.news_channel_id = news_channel_id
-        self.check_interval = check_interval
-        self.last_video_ids: dict[str, str] = {}
-        self._check_task: Optional[tasks.Loop] = None
-
-    async def cog_load(self) -> None:
-        """Called when the cog is loaded."""
-        # Create the check task dynamically with the configured interval
-        @tasks.loop(seconds=self.check_interval)
-        async def check_youtube():
-            await self._check_youtube_feeds()
-
-        @check_youtube.before_loop
-        async def before_check():
-            await self.bot.wait_until_ready()
-
-        self._check_task = check_youtube
-        self._check_task.start()
-        logger.info("YouTube feed monitoring started")
-
-    async def cog_unload(self) -> None:
-        """Called when the cog is unloaded."""
-        if self._check_task:
-            self._check_task.cancel()
-        logger.info("YouTube feed monitoring stopped")
+        super().__init__(
+            bot,
+            news_channel_id,
+            check_interval,
+            max_concurrent_fetches=max_concurrent_fetches,
+            state_file=state_file,
+            session=session,
+        )
+        self.channel_ids: set[str] = set(channel_ids)
+        # Recent video IDs per channel, oldest first, with a set for lookups
+        self.last_video_ids: dict[str, tuple[deque[str], set[str]]] = {}
+        self.rss_base = rss_base
+
+    async def _load_state(self) -> None:
+        """Restore the latest video IDs saved by a previous run."""
+        try:
+            state = await asyncio.to_thread(read_json, self.state_file)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Could not load YouTube feed state: %s", e)
+            return
+
+        # Channels with saved videos are compared on the first check, so
+        # uploads made while the bot was down still get posted. Older
+        # state files hold a single video ID per channel.
+        for channel_id, video_ids in state.get("last_video_ids", {}).items():
+            if isinstance(video_ids, str):
+                video_ids = [video_ids]
+            for video_id in video_ids:
+                self._seen(channel_id, video_id)
+        logger.info("Loaded latest videos for %s channels from %s", len(self.last_video_ids), self.state_file)
+
+    async def _save_state(self) -> None:
+        """Write the latest video IDs to disk without blocking the event loop."""
+        self._state_dirty = False
+        state = {
+            "last_video_ids": {
+                channel_id: list(history)
+                for channel_id, (history, _) in self.last_video_ids.items()
+            }
+        }
+        try:
+            await asyncio.to_thread(write_json, self.state_file, state)
+        except Exception as e:
+            logger.error("Could not save YouTube feed state: %s", e)
+
+    async def _check_feeds(self) -> None:
+        """Check the YouTube channels, run by the check loop."""
+        await self._check_youtube_feeds()
 
     async def _check_youtube_feeds(self) -> None:
         """Check all configured YouTube channels for new videos."""
-        for channel_id in self.channel_ids:
-            try:
-                await self._check_channel(channel_id)
-            except Exception as e:
-                logger.error(f"Error checking YouTube channel {channel_id}: {e}")
-            # Small delay between channel checks to avoid rate limiting
-            await asyncio.sleep(2)
-
-    async def _check_channel(self, channel_id: str) -> None:
+        # Snapshot the channels, more may be added while we await
+        channel_ids = tuple(self.channel_ids)
+        results = await asyncio.gather(
+            *(self._check_channel(channel_id) for channel_id in channel_ids),
+            return_exceptions=True,
+        )
+        embeds: list[discord.Embed] = []
+        for channel_id, result in zip(channel_ids, results):
+            if isinstance(result, Exception):
+                logger.error("Error checking YouTube channel %s: %s", channel_id, result)
+            elif result is not None:
+                embeds.append(result)
+
+        if embeds:
+            await self._post_embeds(embeds)
+
+    async def _check_channel(self, channel_id: str) -> Optional[discord.Embed]:
         """
         Check a single YouTube channel for new videos.
 
         Args:
             channel_id: The YouTube channel ID to check
+
+        Returns:
+            An embed for the channel's new video, or None if there is none
         """
-        feed_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+        feed_url = f"{self.rss_base}?channel_id={channel_id}"
 
-        # Run feedparser in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        feed = await loop.run_in_executor(None, feedparser.parse, feed_url)
+        feed = await self._fetch_feed(feed_url)
+        if feed is None:
+            return None  # Unchanged since the last check
 
         if feed.bozo:
-            logger.warning(f"Error parsing feed for channel {channel_id}: {feed.bozo_exception}")
-            return
+            logger.warning("Error parsing feed for channel %s: %s", channel_id, feed.bozo_exception)
+            return None
 
         if not feed.entries:
-            return
+            return None
 
         latest_entry = feed.entries[0]
         video_id = latest_entry.get("yt_videoid", "")
 
         if not video_id:
-            return
+            return None
+
+        first_check = channel_id not in self.last_video_ids
+        if self._seen(channel_id, video_id):
+            return None  # Already posted this video
+        self._state_dirty = True
 
-        # Check if this is a new video
-        if channel_id in self.last_video_ids:
-            if self.last_video_ids[channel_id] == video_id:
-                return  # Already posted this video
-        else:
+        if first_check:
             # First run for this channel, just store the ID without posting
-            self.last_video_ids[channel_id] = video_id
-            logger.info(f"Initialized tracking for channel {channel_id}, latest video: {video_id}")
-            return
+            logger.info("Initialized tracking for channel %s, latest video: %s", channel_id, video_id)
+            return None
 
         # New video detected!
-        self.last_video_ids[channel_id] = video_id
-        await self._post_video(latest_entry, feed.feed.get("title", "Unknown Channel"))
+        return self._build_video_embed(latest_entry, feed.feed.get("title", "Unknown Channel"))
+
+    def _seen(self, channel_id: str, video_id: str) -> bool:
+        """
+        Check whether a video was seen before, recording it if not.
+
+        Args:
+            channel_id: The YouTube channel the video belongs to
+            video_id: The YouTube video ID
+
+        Returns:
+            True if the video was already in the channel's history
+        """
+        history, ids = self.last_video_ids.setdefault(
+            channel_id, (deque(maxlen=_VIDEO_HISTORY), set())
+        )
+        if video_id in ids:
+            return True
+
+        if len(history) == history.maxlen:
+            ids.discard(history[0])
+        history.append(video_id)
+        ids.add(video_id)
+        return False
+
+    async def _fetch_feed(self, feed_url: str) -> Optional[feedparser.FeedParserDict]:
+        """
+        Download and parse a YouTube channel feed.
+
+        Args:
+            feed_url: The channel's Atom feed URL
+
+        Returns:
+            The parsed feed, or None if it has not changed since the last fetch
+        """
+        download = await self._download(feed_url)
+        if download is None:
+            return None
+        body, _ = download
+
+        # YouTube feeds have a small fixed schema, so only the newest entry
+        # is pulled out instead of running the full feedparser pipeline.
+        # Parse in executor to avoid blocking.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _parse_latest_video, body)
 
     async def _post_video(self, entry: dict, channel_name: str) -> None:
         """
@@ -117,11 +269,19 @@ class YouTubeFeed(commands.Cog):
             entry: The feed entry containing video information
             channel_name: The name of the YouTube channel
         """
-        channel = self.bot.get_channel(self.news_channel_id)
-        if not channel:
-            logger.error(f"Could not find Discord channel {self.news_channel_id}")
-            return
+        await self._post_embeds([self._build_video_embed(entry, channel_name)])
 
+    def _build_video_embed(self, entry: dict, channel_name: str) -> discord.Embed:
+        """
+        Build the notification embed for a video.
+
+        Args:
+            entry: The feed entry containing video information
+            channel_name: The name of the YouTube channel
+
+        Returns:
+            The video embed
+        """
         video_title = entry.get("title", "Unknown Title")
         video_url = entry.get("link", "")
         published = entry.get("published", "")
@@ -131,18 +291,24 @@ class YouTubeFeed(commands.Cog):
             url=video_url,
             description=f"**{channel_name}** just uploaded a new video!",
             color=discord.Color.red(),
-            timestamp=datetime.now(timezone.utc),
+            timestamp=discord.utils.utcnow(),
         )
 
-        # Try to get thumbnail
-        if "media_thumbnail" in entry and entry["media_thumbnail"]:
-            embed.set_thumbnail(url=entry["media_thumbnail"][0].get("url", ""))
+        # Use the feed's thumbnail, or build one from the video ID
+        thumbnails = entry.get("media_thumbnail")
+        video_id = entry.get("yt_videoid")
+        if thumbnails:
+            embed.set_thumbnail(url=thumbnails[0].get("url", ""))
+        elif video_id:
+            embed.set_thumbnail(url=f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg")
 
-        embed.add_field(name="Published", value=published or "Unknown", inline=True)
+        embed.add_field(
+            name="Published",
+            value=format_published(published) if published else "Unknown",
+            inline=True,
+        )
         embed.set_footer(text="Qurrent Events • YouTube")
-
-        await channel.send(embed=embed)
-        logger.info(f"Posted new video: {video_title} from {channel_name}")
+        return embed
 
     @commands.command(name="youtube")
     async def youtube_status(self, ctx: commands.Context) -> None:
@@ -164,7 +330,7 @@ class YouTubeFeed(commands.Cog):
         )
         embed.add_field(
             name="Videos Tracked",
-            value=str(len(self.last_video_ids)),
+            value=str(sum(len(history) for history, _ in self.last_video_ids.values())),
             inline=True,
         )
 
@@ -182,5 +348,8 @@ async def setup(bot: commands.Bot) -> None:
             channel_ids=config.get("channel_ids", []),
             news_channel_id=config.get("news_channel_id", 0),
             check_interval=config.get("check_interval", 3600),
+            max_concurrent_fetches=config.get("max_concurrent_fetches", 10),
+            session=getattr(bot, "http_session", None),
+            rss_base=config.get("rss_base", DEFAULT_YOUTUBE_RSS_BASE),
         )
     )
@@ -1,13 +1,16 @@
 """Configuration management for the Qurrent Events Discord Bot."""
 
+import functools
 import os
 from dataclasses import dataclass, field
 from typing import Optional
 
 from dotenv import load_dotenv
 
+DEFAULT_YOUTUBE_RSS_BASE = "https://www.youtube.com/feeds/videos.xml"
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class BotConfig:
     """Configuration settings for the Discord bot."""
 
@@ -25,41 +28,19 @@ class BotConfig:
     youtube_check_interval: int = 3600  # 1 hour
     news_check_interval: int = 1800  # 30 minutes
 
+    # Base URL of the YouTube channel Atom feeds, takes a channel_id query
+    youtube_rss_base: str = DEFAULT_YOUTUBE_RSS_BASE
+
     @classmethod
     def from_env(cls) -> "BotConfig":
-        """Load configuration from environment variables."""
-        load_dotenv()
-
-        # Parse YouTube channels from comma-separated string
-        youtube_channels_str = os.getenv("YOUTUBE_CHANNELS", "")
-        youtube_channels = (
-            [ch.strip() for ch in youtube_channels_str.split(",") if ch.strip()]
-            if youtube_channels_str
-            else cls._get_default_youtube_channels()
-        )
-
-        # Parse news feeds from comma-separated string
-        news_feeds_str = os.getenv("NEWS_FEEDS", "")
-        news_feeds = (
-            [feed.strip() for feed in news_feeds_str.split(",") if feed.strip()]
-            if news_feeds_str
-            else cls._get_default_news_feeds()
-        )
-
-        channel_id_str = os.getenv("NEWS_CHANNEL_ID", "0")
-        try:
-            channel_id = int(channel_id_str)
-        except ValueError:
-            channel_id = 0
-
-        return cls(
-            discord_token=os.getenv("DISCORD_TOKEN", ""),
-            news_channel_id=channel_id,
-            youtube_channels=youtube_channels,
-            news_feeds=news_feeds,
-            youtube_check_interval=int(os.getenv("YOUTUBE_CHECK_INTERVAL", "3600")),
-            news_check_interval=int(os.getenv("NEWS_CHECK_INTERVAL", "1800")),
-        )
+        """
+        Load configuration from environment variables.
+
+        The environment is read once and the result is cached, so repeated
+        calls return the same instance. Tests that change the environment
+        call ``_load_config.cache_clear()`` in between.
+        """
+        return _load_config()
 
     @staticmethod
     def _get_default_youtube_channels() -> list[str]:
@@ -97,3 +78,41 @@ class BotConfig:
         if not self.news_channel_id:
             return False, "NEWS_CHANNEL_ID is required"
         return True, None
+
+
+@functools.lru_cache(maxsize=1)
+def _load_config() -> BotConfig:
+    """Build the bot configuration from the environment and a .env file."""
+    load_dotenv()
+
+    # Parse YouTube channels from comma-separated string
+    youtube_channels_str = os.getenv("YOUTUBE_CHANNELS", "")
+    youtube_channels = (
+        [ch.strip() for ch in youtube_channels_str.split(",") if ch.strip()]
+        if youtube_channels_str
+        else BotConfig._get_default_youtube_channels()
+    )
+
+    # Parse news feeds from comma-separated string
+    news_feeds_str = os.getenv("NEWS_FEEDS", "")
+    news_feeds = (
+        [feed.strip() for feed in news_feeds_str.split(",") if feed.strip()]
+        if news_feeds_str
+        else BotConfig._get_default_news_feeds()
+    )
+
+    channel_id_str = os.getenv("NEWS_CHANNEL_ID", "0")
+    try:
+        channel_id = int(channel_id_str)
+    except ValueError:
+        channel_id = 0
+
+    return BotConfig(
+        discord_token=os.getenv("DISCORD_TOKEN", ""),
+        news_channel_id=channel_id,
+        youtube_channels=youtube_channels,
+        news_feeds=news_feeds,
+        youtube_check_interval=int(os.getenv("YOUTUBE_CHECK_INTERVAL", "3600")),
+        news_check_interval=int(os.getenv("NEWS_CHECK_INTERVAL", "1800")),
+        youtube_rss_base=os.getenv("YOUTUBE_RSS_BASE") or DEFAULT_YOUTUBE_RSS_BASE,
+    )
@@ -0,0 +1,87 @@
+"""Helpers for building Discord embeds and sending them in few messages."""
+
+import functools
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Iterator, Optional
+
+import discord
+
+# Discord accepts at most 10 embeds per message, and the combined text of
+# all embeds in a message may not exceed 6000 characters
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+
+def batch_embeds(embeds: Iterable[discord.Embed]) -> Iterator[list[discord.Embed]]:
+    """
+    Group embeds into batches that fit in a single Discord message.
+
+    Args:
+        embeds: The embeds to send, in posting order
+
+    Yields:
+        Lists of embeds that can be sent together with ``send(embeds=...)``
+    """
+    batch: list[discord.Embed] = []
+    batch_chars = 0
+    for embed in embeds:
+        embed_chars = len(embed)
+        if batch and (
+            len(batch) == MAX_EMBEDS_PER_MESSAGE
+            or batch_chars + embed_chars > MAX_EMBED_CHARS_PER_MESSAGE
+        ):
+            yield batch
+            batch = []
+            batch_chars = 0
+        batch.append(embed)
+        batch_chars += embed_chars
+
+    if batch:
+        yield batch
+
+
+@functools.lru_cache(maxsize=256)
+def parse_published(published: str) -> Optional[datetime]:
+    """
+    Parse a feed entry's publication date.
+
+    Atom feeds use ISO 8601 dates and RSS feeds use RFC 822 dates, so
+    the ISO parser is tried first and the email date parser second.
+    Results are cached, since entries of one feed often share a date.
+
+    Args:
+        published: The raw date string from the feed
+
+    Returns:
+        An aware datetime, or None if the string is not a known format
+    """
+    try:
+        parsed = datetime.fromisoformat(published.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(published)
+        except (TypeError, ValueError):
+            return None
+
+    # Dates without an offset are taken to be UTC
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def format_published(published: str) -> str:
+    """
+    Format a feed entry's publication date for an embed field.
+
+    Args:
+        published: The raw date string from the feed
+
+    Returns:
+        A Discord timestamp shown in each reader's time zone, or the
+        start of the raw string if it could not be parsed
+    """
+    parsed = parse_published(published)
+    if parsed is None:
+        return published[:25]
+    return discord.utils.format_dt(parsed, style="f")
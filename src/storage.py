@@ -0,0 +1,50 @@
+"""JSON file helpers shared by the bot and its cogs."""
+
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def read_json(path: str) -> Any:
+    """
+    Read and decode a JSON file.
+
+    Args:
+        path: Path of the file to read
+
+    Returns:
+        The decoded JSON data
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def write_json(path: str, data: Any) -> None:
+    """
+    Write data to a file as indented JSON.
+
+    The data is written to a temporary file first and then moved into
+    place, so readers never see a partially written file.
+
+    Args:
+        path: Path of the file to write
+        data: JSON serializable data
+    """
+    if orjson:
+        encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        encoded = json.dumps(data, indent=2).encode()
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encoded)
+    os.replace(tmp_path, path)
@@ -13,6 +13,8 @@ from src.config import BotConfig
 
 class MockBot:
     """Mock bot for testing post formats."""
+
+    __slots__ = ("token", "channel_id", "client")
     
     def __init__(self, token: str, channel_id: int):
         self.token = token
@@ -0,0 +1,63 @@
+"""Shared fixtures for the test suite."""
+
+import copy
+from collections import deque
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+
+@pytest.fixture(scope="session")
+def mock_bot_factory():
+    """Return a function that creates mock bot instances."""
+
+    def make_bot():
+        bot = MagicMock()
+        bot.wait_until_ready = AsyncMock()
+        return bot
+
+    return make_bot
+
+
+class FakeBot:
+    """Lightweight bot stand-in for tests that don't inspect bot calls."""
+
+    def __init__(self):
+        self.channel = None
+
+    async def wait_until_ready(self):
+        return None
+
+    def get_channel(self, channel_id):
+        return self.channel
+
+
+@pytest.fixture(scope="module")
+def fake_bot():
+    """Create a fake bot instance shared by the tests in a module."""
+    return FakeBot()
+
+
+@pytest.fixture
+def restore_after():
+    """
+    Return a function that restores objects' attributes after the test.
+
+    Containers are deep copied, so changes made to them in place are undone
+    too. Other attributes, such as the bot a cog refers to, are kept as is.
+    """
+    snapshots = []
+
+    def register(*objects):
+        for obj in objects:
+            attrs = {
+                name: copy.deepcopy(value) if isinstance(value, (dict, list, set, deque)) else value
+                for name, value in vars(obj).items()
+            }
+            snapshots.append((obj, attrs))
+
+    yield register
+
+    for obj, attrs in snapshots:
+        vars(obj).clear()
+        vars(obj).update(attrs)
@@ -4,12 +4,19 @@ import os
 import pytest
 from unittest.mock import patch
 
-from src.config import BotConfig
+from src.config import BotConfig, _load_config
 
 
 class TestBotConfig:
     """Test cases for BotConfig class."""
 
+    @pytest.fixture(autouse=True)
+    def clear_config_cache(self):
+        """Make each test read the environment it patches."""
+        _load_config.cache_clear()
+        yield
+        _load_config.cache_clear()
+
     def test_default_youtube_channels(self):
         """Test that default YouTube channels are returned."""
         channels = BotConfig._get_default_youtube_channels()
@@ -117,3 +124,26 @@ class TestBotConfig:
         """Test handling of invalid channel ID."""
         config = BotConfig.from_env()
         assert config.news_channel_id == 0
+
+    @patch.dict(
+        os.environ,
+        {
+            "DISCORD_TOKEN": "test_token",
+            "NEWS_CHANNEL_ID": "123456789",
+            "YOUTUBE_RSS_BASE": "https://mirror.example/feeds/videos.xml",
+        },
+    )
+    def test_from_env_youtube_rss_base(self):
+        """Test overriding the YouTube feed base URL from environment."""
+        config = BotConfig.from_env()
+        assert config.youtube_rss_base == "https://mirror.example/feeds/videos.xml"
+
+    def test_from_env_cached(self):
+        """Test that the environment is only parsed once."""
+        assert BotConfig.from_env() is BotConfig.from_env()
+
+    def test_config_frozen(self):
+        """Test that configuration cannot be reassigned after loading."""
+        config = BotConfig(discord_token="test_token")
+        with pytest.raises(AttributeError):
+            config.discord_token = "other"
@@ -0,0 +1,76 @@
+"""Tests for the embed batching helpers."""
+
+from datetime import datetime, timezone
+
+import discord
+import pytest
+
+from src.embeds import (
+    MAX_EMBED_CHARS_PER_MESSAGE,
+    batch_embeds,
+    format_published,
+    parse_published,
+)
+
+
+class TestBatchEmbeds:
+    """Test cases for batch_embeds."""
+
+    def test_empty(self):
+        """Test that no embeds produce no batches."""
+        assert list(batch_embeds([])) == []
+
+    def test_ten_per_batch(self):
+        """Test that batches hold at most ten embeds, in order."""
+        embeds = [discord.Embed(title=f"Article {i}") for i in range(23)]
+
+        batches = list(batch_embeds(embeds))
+
+        assert [len(batch) for batch in batches] == [10, 10, 3]
+        assert [embed for batch in batches for embed in batch] == embeds
+
+    def test_character_limit(self):
+        """Test that a batch is split before it exceeds the character limit."""
+        embeds = [discord.Embed(description="x" * 2500) for _ in range(5)]
+
+        batches = list(batch_embeds(embeds))
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        for batch in batches:
+            assert sum(len(embed) for embed in batch) <= MAX_EMBED_CHARS_PER_MESSAGE
+
+    def test_oversized_embed_sent_alone(self):
+        """Test that an embed over the limit still gets a batch of its own."""
+        embeds = [
+            discord.Embed(title="Small"),
+            discord.Embed(description="x" * (MAX_EMBED_CHARS_PER_MESSAGE + 1)),
+            discord.Embed(title="Small"),
+        ]
+
+        assert [len(batch) for batch in batch_embeds(embeds)] == [1, 1, 1]
+
+
+class TestPublishedDates:
+    """Test cases for parsing and formatting publication dates."""
+
+    @pytest.mark.parametrize(
+        "published",
+        [
+            "2024-01-01T00:00:00Z",  # Atom, UTC designator
+            "2024-01-01T01:00:00+01:00",  # Atom, with an offset
+            "Mon, 01 Jan 2024 00:00:00 +0000",  # RSS
+            "Mon, 01 Jan 2024 00:00:00 GMT",  # RSS, named zone
+        ],
+    )
+    def test_parse_published(self, published):
+        """Test that Atom and RSS dates parse to the same instant."""
+        assert parse_published(published) == datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def test_parse_published_invalid(self):
+        """Test that unknown date formats are not guessed at."""
+        assert parse_published("sometime last week") is None
+
+    def test_format_published(self):
+        """Test that parsed dates become Discord timestamps."""
+        assert format_published("2024-01-01T00:00:00Z") == "<t:1704067200:f>"
+        assert format_published("x" * 40) == "x" * 25
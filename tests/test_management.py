@@ -0,0 +1,123 @@
+"""Tests for the management commands cog."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.cogs.management import ManagementCommands
+
+
+class TestManagementCommandsAsync:
+    """Async test cases for ManagementCommands cog."""
+
+    @pytest.fixture
+    def mock_bot(self, mock_bot_factory):
+        """Create a mock bot instance."""
+        bot = mock_bot_factory()
+        bot.youtube_cog.channel_ids = set()
+        return bot
+
+    @pytest.fixture
+    def management(self, mock_bot):
+        """Create a ManagementCommands instance for testing."""
+        return ManagementCommands(mock_bot)
+
+    @pytest.mark.parametrize(
+        "channel_id",
+        [
+            "UC1yNl2E66ZzKApQdRuTQ4t",  # Too short
+            "UC1yNl2E66ZzKApQdRuTQ4tww",  # Too long
+            "XX1yNl2E66ZzKApQdRuTQ4tw",  # Wrong prefix
+            "UC1yNl2E66ZzKApQdRuTQ4t!",  # Not base64url
+        ],
+    )
+    async def test_add_youtube_source_invalid_id(self, management, mock_bot, channel_id):
+        """Test that malformed channel IDs are rejected."""
+        ctx = AsyncMock()
+
+        await management.add_youtube_source.callback(management, ctx, channel_id)
+
+        assert "Invalid YouTube channel ID" in ctx.send.call_args.args[0]
+        assert mock_bot.youtube_cog.channel_ids == set()
+
+    async def test_add_youtube_source_valid_id(self, management, mock_bot):
+        """Test that a valid channel ID is added and queued for saving."""
+        ctx = AsyncMock()
+        channel_id = "UC1yNl2E66ZzKApQdRuTQ4tw"
+
+        await management.add_youtube_source.callback(management, ctx, channel_id)
+
+        assert channel_id in mock_bot.youtube_cog.channel_ids
+        mock_bot.add_dynamic_source.assert_called_once_with("youtube_channels", channel_id)
+
+    async def test_list_sources_truncates_sorted(self, management, mock_bot):
+        """Test that list-sources shows the first channels in sorted order."""
+        ctx = AsyncMock()
+        mock_bot.youtube_cog.channel_ids = {f"UC{i:022d}" for i in range(12, 0, -1)}
+        mock_bot.news_cog.feed_urls = {"https://b.example/feed", "https://a.example/feed"}
+
+        await management.list_sources.callback(management, ctx)
+
+        embed = ctx.send.call_args.kwargs["embed"]
+        youtube_field, rss_field = embed.fields
+        lines = youtube_field.value.split("\n")
+        assert lines[0] == f"• `UC{1:022d}`"
+        assert lines[-1] == "... and 2 more"
+        assert len(lines) == 11
+        assert rss_field.value.split("\n") == [
+            "• https://a.example/feed",
+            "• https://b.example/feed",
+        ]
+
+    async def test_status_fields(self, management, mock_bot):
+        """Test that status reports bot and cog fields in order."""
+        ctx = AsyncMock()
+        mock_bot.latency = 0.042
+        mock_bot.guilds = [MagicMock()]
+        mock_bot.youtube_cog.channel_ids = {"UC1yNl2E66ZzKApQdRuTQ4tw"}
+        mock_bot.news_cog = None
+
+        await management.status.callback(management, ctx)
+
+        embed = ctx.send.call_args.kwargs["embed"]
+        assert [field.name for field in embed.fields] == ["Bot", "Guilds", "Latency", "YouTube"]
+        assert embed.fields[2].value == "42ms"
+        assert embed.fields[3].value == "✅ Monitoring 1 channels"
+
+    async def test_add_rss_source_batch(self, management, mock_bot):
+        """Test that several feeds are added and acknowledged in one message."""
+        ctx = AsyncMock()
+        mock_bot.news_cog.feed_urls = {"https://c.example/feed"}
+
+        await management.add_rss_source.callback(
+            management,
+            ctx,
+            "https://a.example/feed",
+            "ftp://b.example/feed",
+            "https://c.example/feed",
+            "https://d.example/feed",
+        )
+
+        ctx.send.assert_called_once()
+        embed = ctx.send.call_args.kwargs["embed"]
+        assert embed.title == "✅ RSS Feeds Added"
+        assert "`https://a.example/feed`, `https://d.example/feed`" in embed.description
+        assert embed.fields[0].value == "3"
+        skipped = embed.fields[1].value
+        assert "Invalid RSS feed URL `ftp://b.example/feed`" in skipped
+        assert "Already monitoring RSS feed: `https://c.example/feed`" in skipped
+        assert mock_bot.add_dynamic_source.call_count == 2
+
+    async def test_add_rss_source_many_summarized(self, management, mock_bot):
+        """Test that a long list of added feeds is summarized to fit the embed."""
+        ctx = AsyncMock()
+        mock_bot.news_cog.feed_urls = set()
+        feed_urls = [f"https://example.com/{'x' * 200}/{i}" for i in range(30)]
+
+        await management.add_rss_source.callback(management, ctx, *feed_urls)
+
+        embed = ctx.send.call_args.kwargs["embed"]
+        assert len(embed.description) <= 4096
+        assert embed.description.count("`") == 20
+        assert embed.description.endswith("\n... and 20 more")
+        assert embed.fields[0].value == "30"
+        assert mock_bot.add_dynamic_source.call_count == 30
@@ -1,32 +1,90 @@
 """Tests for the news feed cog."""
 
+import asyncio
+import logging
+
+import discord
+import feedparser
 import pytest
+import xxhash
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from src.cogs.news_feed import NewsFeed
+from src.cogs.news_feed import _MAX_ENTRIES, NewsFeed, _parse_feed, _parse_news_feed
+
+SAMPLE_RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:sy="http://purl.org/rss/1.0/modules/syndication/"
+     xmlns:content="http://purl.org/rss/1.0/modules/content/">
+ <channel>
+  <title> Quantum News </title>
+  <sy:updatePeriod>daily</sy:updatePeriod>
+  <sy:updateFrequency>2</sy:updateFrequency>
+  <image><title>Logo</title></image>
+  <item>
+   <title>Qubits &amp; more</title>
+   <link>/articles/1</link>
+   <description>&lt;p&gt;New quantum chip&lt;/p&gt;</description>
+   <pubDate>Wed, 04 Dec 2024 15:30:00 +0000</pubDate>
+  </item>
+  <item><title>No link</title></item>
+  <item>
+   <title>Permalink guid</title>
+   <guid>https://example.com/articles/2</guid>
+   <content:encoded><![CDATA[<p>Full quantum article</p>]]></content:encoded>
+  </item>
+  <item>
+   <title>Opaque guid</title>
+   <guid isPermaLink="false">article-3</guid>
+   <description>Short summary</description>
+   <content:encoded>Full text</content:encoded>
+  </item>
+ </channel>
+</rss>"""
+
+SAMPLE_ATOM = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+ <title>Atom News</title>
+ <entry>
+  <title>Aggregated</title>
+  <source>
+   <title>Blog</title>
+   <link href="https://blog.example/"/>
+  </source>
+  <link href="https://example.com/aggregated"/>
+ </entry>
+ <entry>
+  <title>Id only</title>
+  <id>https://example.com/id-only</id>
+ </entry>
+ <entry>
+  <title>Entangled</title>
+  <link rel="self" href="https://example.com/self"/>
+  <link rel="alternate" href="https://example.com/entangled"/>
+  <summary type="html">&lt;b&gt;Spooky&lt;/b&gt;</summary>
+  <updated>2024-01-01T00:00:00Z</updated>
+ </entry>
+</feed>"""
+
+
+@pytest.fixture(scope="module")
+def news_feed(fake_bot):
+    """Create a NewsFeed instance shared by the tests in this module."""
+    return NewsFeed(
+        bot=fake_bot,
+        feed_urls=["https://example.com/feed"],
+        news_channel_id=123456789,
+        check_interval=1800,
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state(restore_after, fake_bot, news_feed):
+    """Undo whatever a test changed on the shared bot and cog."""
+    restore_after(fake_bot, news_feed)
 
 
 class TestNewsFeed:
     """Test cases for NewsFeed cog."""
 
-    @pytest.fixture
-    def mock_bot(self):
-        """Create a mock bot instance."""
-        bot = MagicMock()
-        bot.wait_until_ready = AsyncMock()
-        bot.get_channel = MagicMock()
-        return bot
-
-    @pytest.fixture
-    def news_feed(self, mock_bot):
-        """Create a NewsFeed instance for testing."""
-        return NewsFeed(
-            bot=mock_bot,
-            feed_urls=["https://example.com/feed"],
-            news_channel_id=123456789,
-            check_interval=1800,
-        )
-
     def test_init(self, news_feed):
         """Test NewsFeed initialization."""
         assert len(news_feed.feed_urls) == 1
@@ -34,12 +92,35 @@ class TestNewsFeed:
         assert news_feed.check_interval == 1800
         assert len(news_feed.seen_articles) == 0
 
+    def test_feed_urls_deduplicated(self, fake_bot):
+        """Test that duplicate feed URLs are only monitored once."""
+        news_feed = NewsFeed(
+            bot=fake_bot,
+            feed_urls=["https://example.com/feed", "https://example.com/feed"],
+            news_channel_id=123456789,
+        )
+        assert news_feed.feed_urls == {"https://example.com/feed"}
+
+    def test_mark_seen_lru(self, fake_bot):
+        """Test that seen IDs are capped and refreshed on repeat sightings."""
+        news_feed = NewsFeed(
+            bot=fake_bot,
+            feed_urls=["https://example.com/feed"],
+            news_channel_id=123456789,
+            max_seen_articles=2,
+        )
+        assert news_feed._mark_seen(1)
+        assert news_feed._mark_seen(2)
+        assert not news_feed._mark_seen(1)  # Refreshes 1, so 2 is now oldest
+        assert news_feed._mark_seen(3)
+        assert list(news_feed.seen_articles) == [1, 3]
+
     def test_get_article_id(self, news_feed):
         """Test article ID generation."""
         entry = {"link": "https://example.com/article1"}
         article_id = news_feed._get_article_id(entry)
-        assert isinstance(article_id, str)
-        assert len(article_id) == 16
+        assert isinstance(article_id, int)
+        assert 0 <= article_id < 2**64
 
         # Same entry should produce same ID
         article_id_2 = news_feed._get_article_id(entry)
@@ -50,10 +131,17 @@ class TestNewsFeed:
         article_id_3 = news_feed._get_article_id(entry_2)
         assert article_id != article_id_3
 
-    def test_is_quantum_related_positive(self, news_feed):
-        """Test quantum keyword detection for related articles."""
-        # Articles that should be detected as quantum-related
-        quantum_entries = [
+    def test_get_article_id_without_link(self, news_feed):
+        """Test that entries without a link are identified by title and summary."""
+        entry = {"title": "Quantum", "summary": "Qubits"}
+        assert news_feed._get_article_id(entry) == xxhash.xxh64_intdigest(b"QuantumQubits")
+        assert news_feed._get_article_id(entry) != news_feed._get_article_id(
+            {"title": "Quantum", "summary": "Gates"}
+        )
+
+    @pytest.mark.parametrize(
+        "entry",
+        [
             {"title": "New Quantum Computer Breakthrough", "summary": ""},
             {"title": "", "summary": "Scientists achieve qubit stability"},
             {"title": "IBM Quantum announces new processor", "summary": ""},
@@ -61,22 +149,26 @@ class TestNewsFeed:
             {"title": "Quantum supremacy achieved", "summary": ""},
             {"title": "IonQ releases new system", "summary": ""},
             {"title": "", "summary": "Quantum error correction improved"},
-        ]
-
-        for entry in quantum_entries:
-            assert news_feed._is_quantum_related(entry), f"Should detect: {entry}"
+            {"title": "D-Wave annealer sold", "summary": ""},
+            {"title": "Rigetti stock rises", "summary": ""},
+            {"title": "", "summary": "Photons held in superposition"},
+        ],
+    )
+    def test_is_quantum_related_positive(self, news_feed, entry):
+        """Test quantum keyword detection for related articles."""
+        assert news_feed._is_quantum_related(entry)
 
-    def test_is_quantum_related_negative(self, news_feed):
-        """Test quantum keyword detection for unrelated articles."""
-        # Articles that should NOT be detected as quantum-related
-        non_quantum_entries = [
+    @pytest.mark.parametrize(
+        "entry",
+        [
             {"title": "New iPhone Released", "summary": "Apple announces new phone"},
             {"title": "Stock Market Update", "summary": "Markets close higher today"},
             {"title": "Weather Forecast", "summary": "Rain expected tomorrow"},
-        ]
-
-        for entry in non_quantum_entries:
-            assert not news_feed._is_quantum_related(entry), f"Should not detect: {entry}"
+        ],
+    )
+    def test_is_quantum_related_negative(self, news_feed, entry):
+        """Test quantum keyword detection for unrelated articles."""
+        assert not news_feed._is_quantum_related(entry)
 
     def test_clean_html(self, news_feed):
         """Test HTML cleaning."""
@@ -92,32 +184,75 @@ class TestNewsFeed:
         nbsp_text = "Hello&nbsp;World"
         assert news_feed._clean_html(nbsp_text) == "Hello World"
 
+        # Test numeric and less common named entities
+        assert news_feed._clean_html("It&#39;s &#x201C;quantum&#x201D;") == "It's “quantum”"
+        assert news_feed._clean_html("Schr&ouml;dinger &mdash; &hellip;") == "Schrödinger — …"
+
+        # Test plain text passes through apart from surrounding whitespace
+        assert news_feed._clean_html("  No markup here 1 > 0  ") == "No markup here 1 > 0"
+
+    @pytest.mark.parametrize(
+        "feed_info, expected",
+        [
+            ({"ttl": "120"}, 7200),
+            ({"sy_updateperiod": "daily", "sy_updatefrequency": "2"}, 43200),
+            ({"sy_updateperiod": "hourly"}, 3600),
+            ({"sy_updateperiod": "yearly"}, 86400),  # Capped at a day
+            ({"ttl": "soon"}, None),
+            ({"sy_updateperiod": "fortnightly"}, None),
+            ({}, None),
+        ],
+    )
+    def test_feed_update_interval(self, news_feed, feed_info, expected):
+        """Test reading ttl and syndication update hints from a feed."""
+        assert news_feed._feed_update_interval(feed_info) == expected
+
+    @pytest.mark.parametrize("body", [SAMPLE_RSS, SAMPLE_ATOM])
+    def test_parse_news_feed_matches_feedparser(self, body):
+        """Test that the fast parser gives the fields feedparser would."""
+        url = "https://example.com/feed"
+        parsed = _parse_news_feed(body, url)
+        expected = feedparser.parse(body, response_headers={"content-location": url})
+
+        assert parsed.feed.title == expected.feed.title
+        assert parsed.feed.get("sy_updateperiod") == expected.feed.get("sy_updateperiod")
+        assert parsed.feed.get("sy_updatefrequency") == expected.feed.get("sy_updatefrequency")
+        assert len(parsed.entries) == len(expected.entries)
+        for entry, expected_entry in zip(parsed.entries, expected.entries):
+            for key in ("title", "link", "summary", "published"):
+                assert entry.get(key) == expected_entry.get(key)
+
+    def test_parse_news_feed_stops_after_max_entries(self):
+        """Test that only the entries the cog checks are parsed."""
+        items = b"".join(b"<item><title>%d</title></item>" % i for i in range(_MAX_ENTRIES + 5))
+        parsed = _parse_news_feed(b"<rss><channel>" + items + b"</channel></rss>", "")
+
+        assert [entry["title"] for entry in parsed.entries] == [str(i) for i in range(_MAX_ENTRIES)]
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b"<rss><channel><item><title>Broken",
+            b'<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"/>',
+        ],
+    )
+    def test_parse_feed_falls_back_to_feedparser(self, body):
+        """Test that malformed or unsupported feeds are left to feedparser."""
+        headers = {"content-type": "application/rss+xml", "content-location": ""}
+        assert _parse_news_feed(body, "") is None
+
+        with patch("src.cogs.news_feed.feedparser.parse") as parse:
+            assert _parse_feed(body, headers) is parse.return_value
+        parse.assert_called_once_with(body, response_headers=headers)
+
 
-@pytest.mark.asyncio
 class TestNewsFeedAsync:
     """Async test cases for NewsFeed cog."""
 
-    @pytest.fixture
-    def mock_bot(self):
-        """Create a mock bot instance."""
-        bot = MagicMock()
-        bot.wait_until_ready = AsyncMock()
-        return bot
-
-    @pytest.fixture
-    def news_feed(self, mock_bot):
-        """Create a NewsFeed instance for testing."""
-        return NewsFeed(
-            bot=mock_bot,
-            feed_urls=["https://example.com/feed"],
-            news_channel_id=123456789,
-            check_interval=1800,
-        )
-
-    async def test_post_article(self, news_feed, mock_bot):
+    async def test_post_article(self, news_feed, fake_bot):
         """Test posting an article to Discord."""
         mock_channel = AsyncMock()
-        mock_bot.get_channel.return_value = mock_channel
+        fake_bot.channel = mock_channel
 
         entry = {
             "title": "Test Article",
@@ -133,13 +268,30 @@ class TestNewsFeedAsync:
 
         # Verify embed was created correctly
         call_args = mock_channel.send.call_args
-        embed = call_args.kwargs.get("embed")
-        assert embed is not None
+        embeds = call_args.kwargs.get("embeds")
+        assert embeds is not None and len(embeds) == 1
+        embed = embeds[0]
         assert "Test Article" in embed.title
+        assert embed.fields[1].value == "<t:1704067200:f>"
+
+    async def test_post_article_long_html_summary(self, news_feed, fake_bot):
+        """Test that long HTML summaries are cleaned before being truncated."""
+        mock_channel = AsyncMock()
+        fake_bot.channel = mock_channel
+        entry = {
+            "title": "Test Article",
+            "link": "https://example.com/article",
+            "summary": "q" * 290 + '<a href="https://example.com/a-very-long-link">link</a> &amp; more',
+        }
 
-    async def test_post_article_no_channel(self, news_feed, mock_bot):
+        await news_feed._post_article(entry, "Test Source")
+
+        embed = mock_channel.send.call_args.kwargs["embeds"][0]
+        assert embed.description == "q" * 290 + "link & ..."
+
+    async def test_post_article_no_channel(self, news_feed, fake_bot):
         """Test handling when Discord channel is not found."""
-        mock_bot.get_channel.return_value = None
+        fake_bot.channel = None
 
         entry = {
             "title": "Test Article",
@@ -149,3 +301,202 @@ class TestNewsFeedAsync:
 
         # Should not raise an exception
         await news_feed._post_article(entry, "Test Source")
+
+    async def test_seen_articles_bounded(self, news_feed):
+        """Test that the oldest article IDs are evicted past the cap."""
+        news_feed._max_seen = 2
+        feed = feedparser.FeedParserDict(
+            bozo=False,
+            feed={"title": "Test Source"},
+            entries=[{"link": f"https://example.com/article{i}"} for i in range(3)],
+        )
+        news_feed._fetch_feed = AsyncMock(return_value=feed)
+
+        await news_feed._check_feed("https://example.com/feed")
+
+        assert len(news_feed.seen_articles) == 2
+        assert news_feed._get_article_id(feed.entries[0]) not in news_feed.seen_articles
+        assert news_feed._get_article_id(feed.entries[2]) in news_feed.seen_articles
+
+    async def test_state_round_trip(self, fake_bot, tmp_path):
+        """Test that seen articles survive a restart via the state file."""
+        state_file = str(tmp_path / "news_state.json")
+        news_feed = NewsFeed(
+            bot=fake_bot,
+            feed_urls=["https://example.com/feed"],
+            news_channel_id=123456789,
+            state_file=state_file,
+        )
+        news_feed.seen_articles.update(dict.fromkeys([1, 2**64 - 1]))
+        await news_feed._save_state()
+
+        restarted = NewsFeed(
+            bot=fake_bot,
+            feed_urls=["https://example.com/feed"],
+            news_channel_id=123456789,
+            state_file=state_file,
+        )
+        await restarted._load_state()
+
+        assert list(restarted.seen_articles) == [1, 2**64 - 1]
+        assert restarted._initialized
+
+    async def test_load_state_missing_file(self, fake_bot, tmp_path):
+        """Test that a missing state file leaves the warm-up run in place."""
+        news_feed = NewsFeed(
+            bot=fake_bot,
+            feed_urls=["https://example.com/feed"],
+            news_channel_id=123456789,
+            state_file=str(tmp_path / "missing.json"),
+        )
+        await news_feed._load_state()
+
+        assert len(news_feed.seen_articles) == 0
+        assert not news_feed._initialized
+
+    async def test_fetch_feed_conditional_get(self, news_feed):
+        """Test that validators are sent back and a 304 skips parsing."""
+        ok = MagicMock(
+            status=200,
+            url="https://example.com/feed",
+            headers={
+                "Content-Type": "application/rss+xml",
+                "ETag": '"abc"',
+                "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+            },
+        )
+        ok.read = AsyncMock(return_value=b"<rss><channel><title>Test</title></channel></rss>")
+        not_modified = MagicMock(status=304, headers={})
+        session = MagicMock()
+        session.get.return_value.__aenter__ = AsyncMock(side_effect=[ok, not_modified])
+        session.get.return_value.__aexit__ = AsyncMock(return_value=False)
+        news_feed._session = session
+
+        feed = await news_feed._fetch_feed("https://example.com/feed")
+        assert feed.feed.title == "Test"
+        assert feed.headers["content-type"] == "application/rss+xml"
+
+        assert await news_feed._fetch_feed("https://example.com/feed") is None
+        assert session.get.call_args.kwargs["headers"] == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        }
+
+    async def test_new_articles_batched(self, news_feed, fake_bot):
+        """Test that new articles from one check are posted ten per message."""
+        mock_channel = AsyncMock()
+        fake_bot.channel = mock_channel
+        news_feed._initialized = True
+
+        def make_feed(start, count):
+            return feedparser.FeedParserDict(
+                bozo=False,
+                feed={"title": "Test Source"},
+                entries=[
+                    {"title": f"Quantum article {i}", "link": f"https://example.com/article{i}"}
+                    for i in range(start, start + count)
+                ],
+            )
+
+        news_feed.feed_urls = {"https://a.example/feed", "https://b.example/feed"}
+        news_feed._fetch_feed = AsyncMock(side_effect=[make_feed(0, 10), make_feed(10, 1)])
+
+        await news_feed._check_news_feeds()
+
+        batch_sizes = [len(call.kwargs["embeds"]) for call in mock_channel.send.call_args_list]
+        assert batch_sizes == [10, 1]
+
+    async def test_rejected_post_does_not_stop_checks(self, news_feed, fake_bot):
+        """Test that a message Discord rejects is logged and later batches still post."""
+        mock_channel = AsyncMock()
+        mock_channel.send.side_effect = [
+            discord.HTTPException(MagicMock(status=400, reason="Bad Request"), "Invalid embed"),
+            None,
+        ]
+        fake_bot.channel = mock_channel
+        embeds = [discord.Embed(title=f"Quantum article {i}") for i in range(11)]
+        news_feed._check_feed = AsyncMock(return_value=embeds)
+
+        await news_feed._check_news_feeds()
+
+        assert mock_channel.send.await_count == 2
+
+    async def test_feed_update_hint_skips_checks(self, news_feed):
+        """Test that a feed with a long ttl is not fetched again right away."""
+        feed = feedparser.FeedParserDict(
+            bozo=False,
+            feed={"title": "Test Source", "ttl": "1440"},
+            entries=[],
+        )
+        news_feed._fetch_feed = AsyncMock(return_value=feed)
+
+        await news_feed._check_news_feeds()
+        await news_feed._check_news_feeds()
+
+        news_feed._fetch_feed.assert_awaited_once()
+
+    async def test_missing_channel_disables_checks(self, news_feed, fake_bot):
+        """Test that monitoring stops when the news channel does not exist."""
+        fake_bot.channel = None
+        news_feed._check_news_feeds = AsyncMock()
+
+        await news_feed.cog_load()
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        assert not news_feed._check_task.is_running()
+        news_feed._check_news_feeds.assert_not_awaited()
+        await news_feed.cog_unload()
+
+    async def test_missing_channel_logged_once(self, news_feed, fake_bot, caplog):
+        """Test that a missing channel is only logged once."""
+        fake_bot.channel = None
+        entry = {"title": "Test Article", "link": "https://example.com/article"}
+
+        with caplog.at_level(logging.ERROR):
+            await news_feed._post_article(entry, "Test Source")
+            await news_feed._post_article(entry, "Test Source")
+
+        assert len(caplog.records) == 1
+
+    async def test_feeds_fetched_concurrently(self, news_feed):
+        """Test that all feeds are downloaded at once and parsed from the bodies."""
+        in_flight = 0
+        max_in_flight = 0
+
+        class FakeResponse:
+            status = 200
+            headers = {"Content-Type": "application/rss+xml"}
+
+            def __init__(self, url):
+                self.url = url
+
+            async def __aenter__(self):
+                nonlocal in_flight, max_in_flight
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                await asyncio.sleep(0)  # Let the other fetches start
+                return self
+
+            async def __aexit__(self, *exc_info):
+                nonlocal in_flight
+                in_flight -= 1
+
+            def raise_for_status(self):
+                pass
+
+            async def read(self):
+                return (
+                    f"<rss><channel><title>{self.url}</title>"
+                    f"<item><title>Item</title><link>{self.url}/1</link></item>"
+                    "</channel></rss>"
+                ).encode()
+
+        news_feed.feed_urls = {f"https://{name}.example/feed" for name in "abc"}
+        news_feed._session = MagicMock()
+        news_feed._session.get.side_effect = lambda url, **kwargs: FakeResponse(url)
+
+        await news_feed._check_news_feeds()
+
+        assert max_in_flight == 3
+        assert len(news_feed.seen_articles) == 3
@@ -1,32 +1,54 @@
 """Tests for the YouTube feed cog."""
 
+import discord
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
-from src.cogs.youtube_feed import YouTubeFeed
+from src.cogs.youtube_feed import _VIDEO_HISTORY, YouTubeFeed, _parse_latest_video
+
+SAMPLE_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015"
+      xmlns:media="http://search.yahoo.com/mrss/"
+      xmlns="http://www.w3.org/2005/Atom">
+ <link rel="self" href="http://www.youtube.com/feeds/videos.xml?channel_id=UC123"/>
+ <title>Test &amp; Channel</title>
+ <entry>
+  <yt:videoId>new123</yt:videoId>
+  <title>Qubits &amp; Gates</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v=new123"/>
+  <published>2024-01-02T00:00:00+00:00</published>
+  <media:group>
+   <media:thumbnail url="https://i1.ytimg.com/vi/new123/hqdefault.jpg" width="480" height="360"/>
+  </media:group>
+ </entry>
+ <entry>
+  <yt:videoId>old456</yt:videoId>
+  <title>Older Video</title>
+ </entry>
+</feed>
+"""
+
+
+@pytest.fixture(scope="module")
+def youtube_feed(fake_bot):
+    """Create a YouTubeFeed instance shared by the tests in this module."""
+    return YouTubeFeed(
+        bot=fake_bot,
+        channel_ids=["UC123", "UC456"],
+        news_channel_id=123456789,
+        check_interval=3600,
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state(restore_after, fake_bot, youtube_feed):
+    """Undo whatever a test changed on the shared bot and cog."""
+    restore_after(fake_bot, youtube_feed)
 
 
 class TestYouTubeFeed:
     """Test cases for YouTubeFeed cog."""
 
-    @pytest.fixture
-    def mock_bot(self):
-        """Create a mock bot instance."""
-        bot = MagicMock()
-        bot.wait_until_ready = AsyncMock()
-        bot.get_channel = MagicMock()
-        return bot
-
-    @pytest.fixture
-    def youtube_feed(self, mock_bot):
-        """Create a YouTubeFeed instance for testing."""
-        return YouTubeFeed(
-            bot=mock_bot,
-            channel_ids=["UC123", "UC456"],
-            news_channel_id=123456789,
-            check_interval=3600,
-        )
-
     def test_init(self, youtube_feed):
         """Test YouTubeFeed initialization."""
         assert len(youtube_feed.channel_ids) == 2
@@ -34,37 +56,56 @@ class TestYouTubeFeed:
         assert youtube_feed.check_interval == 3600
         assert len(youtube_feed.last_video_ids) == 0
 
+    def test_max_concurrent_fetches(self, fake_bot):
+        """Test that the fetch concurrency limit is configurable."""
+        youtube_feed = YouTubeFeed(
+            bot=fake_bot,
+            channel_ids=["UC123"],
+            news_channel_id=123456789,
+            max_concurrent_fetches=3,
+        )
+        assert youtube_feed._fetch_semaphore._value == 3
+
     def test_channel_ids_stored(self, youtube_feed):
         """Test that channel IDs are stored correctly."""
         assert "UC123" in youtube_feed.channel_ids
         assert "UC456" in youtube_feed.channel_ids
 
+    def test_parse_latest_video(self):
+        """Test that only the newest video is parsed from a channel feed."""
+        feed = _parse_latest_video(SAMPLE_FEED)
+        assert not feed.bozo
+        assert feed.feed.get("title") == "Test & Channel"
+        assert feed.entries == [
+            {
+                "title": "Qubits & Gates",
+                "yt_videoid": "new123",
+                "published": "2024-01-02T00:00:00+00:00",
+                "link": "https://www.youtube.com/watch?v=new123",
+                "media_thumbnail": [
+                    {
+                        "url": "https://i1.ytimg.com/vi/new123/hqdefault.jpg",
+                        "width": "480",
+                        "height": "360",
+                    }
+                ],
+            }
+        ]
+
+    def test_parse_latest_video_malformed(self):
+        """Test that malformed XML is reported like feedparser's bozo flag."""
+        feed = _parse_latest_video(b"<feed><entry>")
+        assert feed.bozo
+        assert feed.entries == []
+
 
-@pytest.mark.asyncio
 class TestYouTubeFeedAsync:
     """Async test cases for YouTubeFeed cog."""
 
-    @pytest.fixture
-    def mock_bot(self):
-        """Create a mock bot instance."""
-        bot = MagicMock()
-        bot.wait_until_ready = AsyncMock()
-        return bot
-
-    @pytest.fixture
-    def youtube_feed(self, mock_bot):
-        """Create a YouTubeFeed instance for testing."""
-        return YouTubeFeed(
-            bot=mock_bot,
-            channel_ids=["UC123", "UC456"],
-            news_channel_id=123456789,
-            check_interval=3600,
-        )
-
-    async def test_post_video(self, youtube_feed, mock_bot):
+    async def test_post_video(self, youtube_feed, fake_bot):
         """Test posting a video to Discord."""
         mock_channel = AsyncMock()
-        mock_bot.get_channel.return_value = mock_channel
+        fake_bot.channel = mock_channel
 
         entry = {
             "title": "Test Video",
@@ -79,13 +120,14 @@ class TestYouTubeFeedAsync:
 
         # Verify embed was created correctly
         call_args = mock_channel.send.call_args
-        embed = call_args.kwargs.get("embed")
-        assert embed is not None
+        embeds = call_args.kwargs.get("embeds")
+        assert embeds is not None and len(embeds) == 1
+        embed = embeds[0]
         assert "Test Video" in embed.title
 
-    async def test_post_video_no_channel(self, youtube_feed, mock_bot):
+    async def test_post_video_no_channel(self, youtube_feed, fake_bot):
         """Test handling when Discord channel is not found."""
-        mock_bot.get_channel.return_value = None
+        fake_bot.channel = None
 
         entry = {
             "title": "Test Video",
@@ -95,10 +137,24 @@ class TestYouTubeFeedAsync:
         # Should not raise an exception
         await youtube_feed._post_video(entry, "Test Channel")
 
-    async def test_post_video_with_thumbnail(self, youtube_feed, mock_bot):
+    async def test_post_video_rejected(self, youtube_feed, fake_bot):
+        """Test that a message Discord rejects is logged instead of raised."""
+        mock_channel = AsyncMock()
+        mock_channel.send.side_effect = discord.HTTPException(
+            MagicMock(status=403, reason="Forbidden"), "Missing Permissions"
+        )
+        fake_bot.channel = mock_channel
+        entry = {"title": "Test Video", "link": "https://youtube.com/watch?v=test123"}
+
+        # Should not raise an exception
+        await youtube_feed._post_video(entry, "Test Channel")
+
+        mock_channel.send.assert_awaited_once()
+
+    async def test_post_video_with_thumbnail(self, youtube_feed, fake_bot):
         """Test posting a video with thumbnail."""
         mock_channel = AsyncMock()
-        mock_bot.get_channel.return_value = mock_channel
+        fake_bot.channel = mock_channel
 
         entry = {
             "title": "Test Video",
@@ -111,3 +167,151 @@ class TestYouTubeFeedAsync:
 
         # Verify channel.send was called
         mock_channel.send.assert_called_once()
+
+    def test_thumbnail_from_video_id(self, youtube_feed):
+        """Test that a thumbnail is built from the video ID when the feed has none."""
+        entry = {
+            "title": "Test Video",
+            "link": "https://youtube.com/watch?v=test123",
+            "yt_videoid": "test123",
+        }
+
+        embed = youtube_feed._build_video_embed(entry, "Test Channel")
+
+        assert embed.thumbnail.url == "https://i.ytimg.com/vi/test123/mqdefault.jpg"
+
+    async def test_state_round_trip(self, fake_bot, tmp_path):
+        """Test that the latest video IDs survive a restart via the state file."""
+        state_file = str(tmp_path / "youtube_state.json")
+        youtube_feed = YouTubeFeed(
+            bot=fake_bot,
+            channel_ids=["UC123"],
+            news_channel_id=123456789,
+            state_file=state_file,
+        )
+        youtube_feed._seen("UC123", "video1")
+        await youtube_feed._save_state()
+
+        restarted = YouTubeFeed(
+            bot=fake_bot,
+            channel_ids=["UC123"],
+            news_channel_id=123456789,
+            state_file=state_file,
+        )
+        await restarted._load_state()
+
+        assert list(restarted.last_video_ids["UC123"][0]) == ["video1"]
+        assert restarted._seen("UC123", "video1")
+
+    async def test_old_state_format_loaded(self, fake_bot, tmp_path):
+        """Test that a state file with one video ID per channel still loads."""
+        state_file = tmp_path / "youtube_state.json"
+        state_file.write_text('{"last_video_ids": {"UC123": "video1"}}')
+        youtube_feed = YouTubeFeed(
+            bot=fake_bot,
+            channel_ids=["UC123"],
+            news_channel_id=123456789,
+            state_file=str(state_file),
+        )
+
+        await youtube_feed._load_state()
+
+        assert list(youtube_feed.last_video_ids["UC123"][0]) == ["video1"]
+
+    async def test_status_counts_videos(self, youtube_feed):
+        """Test that the status command counts every remembered video."""
+        ctx = AsyncMock()
+        youtube_feed._seen("UC123", "video1")
+        youtube_feed._seen("UC123", "video2")
+        youtube_feed._seen("UC456", "video3")
+
+        await youtube_feed.youtube_status.callback(youtube_feed, ctx)
+
+        embed = ctx.send.call_args.kwargs["embed"]
+        assert embed.fields[2].name == "Videos Tracked"
+        assert embed.fields[2].value == "3"
+
+    async def test_shared_session_not_closed(self, fake_bot):
+        """Test that unloading the cog leaves a shared session open."""
+        session = MagicMock()
+        session.close = AsyncMock()
+        youtube_feed = YouTubeFeed(
+            bot=fake_bot,
+            channel_ids=["UC123"],
+            news_channel_id=123456789,
+            session=session,
+        )
+
+        await youtube_feed.cog_load()
+        await youtube_feed.cog_unload()
+
+        assert youtube_feed._session is session
+        session.close.assert_not_called()
+
+    async def test_channel_lookup_cached(self, youtube_feed, fake_bot):
+        """Test that the Discord channel is only looked up until it is found."""
+        mock_channel = AsyncMock()
+        entry = {"title": "Test Video", "link": "https://youtube.com/watch?v=test123"}
+
+        await youtube_feed._post_video(entry, "Test Channel")  # Not cached yet
+        fake_bot.channel = mock_channel
+        await youtube_feed._post_video(entry, "Test Channel")
+        fake_bot.channel = None  # Later posts use the cached channel
+        await youtube_feed._post_video(entry, "Test Channel")
+
+        assert youtube_feed._channel is mock_channel
+        assert mock_channel.send.await_count == 2
+
+    async def test_new_videos_batched(self, youtube_feed, fake_bot):
+        """Test that new videos from several channels share one message."""
+        mock_channel = AsyncMock()
+        fake_bot.channel = mock_channel
+        youtube_feed._seen("UC123", "old1")
+        youtube_feed._seen("UC456", "old2")
+        youtube_feed._fetch_feed = AsyncMock(return_value=_parse_latest_video(SAMPLE_FEED))
+
+        await youtube_feed._check_youtube_feeds()
+
+        mock_channel.send.assert_called_once()
+        assert len(mock_channel.send.call_args.kwargs["embeds"]) == 2
+        for channel_id in ("UC123", "UC456"):
+            assert list(youtube_feed.last_video_ids[channel_id][0])[-1] == "new123"
+
+    async def test_earlier_video_not_reposted(self, youtube_feed, fake_bot):
+        """Test that an older video is not posted again when it becomes the newest."""
+        mock_channel = AsyncMock()
+        fake_bot.channel = mock_channel
+        youtube_feed._seen("UC123", "new123")
+        youtube_feed._seen("UC123", "newer456")  # Since deleted from the feed
+        youtube_feed._fetch_feed = AsyncMock(return_value=_parse_latest_video(SAMPLE_FEED))
+
+        assert await youtube_feed._check_channel("UC123") is None
+
+        assert list(youtube_feed.last_video_ids["UC123"][0]) == ["new123", "newer456"]
+
+    def test_video_history_bounded(self, youtube_feed):
+        """Test that only the most recent videos per channel are remembered."""
+        for i in range(_VIDEO_HISTORY + 1):
+            assert not youtube_feed._seen("UC123", f"video{i}")
+
+        history, ids = youtube_feed.last_video_ids["UC123"]
+        assert len(history) == len(ids) == _VIDEO_HISTORY
+        assert "video0" not in ids
+        assert youtube_feed._seen("UC123", f"video{_VIDEO_HISTORY}")
+
+    async def test_not_modified_feed_skipped(self, youtube_feed):
+        """Test that a 304 response ends the check without parsing."""
+        not_modified = MagicMock(status=304)
+        session = MagicMock()
+        session.get.return_value.__aenter__ = AsyncMock(return_value=not_modified)
+        session.get.return_value.__aexit__ = AsyncMock(return_value=False)
+        youtube_feed._session = session
+        feed_url = f"{youtube_feed.rss_base}?channel_id=UC123"
+        youtube_feed._etags[feed_url] = '"abc"'
+        youtube_feed._seen("UC123", "old1")
+
+        assert await youtube_feed._check_channel("UC123") is None
+
+        assert session.get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+        not_modified.read.assert_not_called()
+        assert list(youtube_feed.last_video_ids["UC123"][0]) == ["old1"]